@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -14,7 +15,93 @@ class Settings(BaseSettings):
     # CORS
     FRONTEND_URL: str = "http://localhost:3000"
     
+    # SQLite mode (file databases only): WAL, one writer connection, read pool
+    SQLITE_OPTIMIZED: bool = True
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = 30.0
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    
+    # Startup: create missing tables/indexes (disable once the schema is managed elsewhere)
+    SCHEMA_CHECK_ON_STARTUP: bool = True
+    # Preload the most active polls before reporting ready on /ready
+    WARMUP_ENABLED: bool = True
+    WARMUP_POLL_COUNT: int = 200
+    
+    # In-process poll cache (definitions and counts)
+    POLL_CACHE_MAX_POLLS: int = 2000
+    # Counts can be up to this stale across workers; 0 reads them from the
+    # shared tally store or the database on every request
+    POLL_CACHE_COUNTS_TTL_SECONDS: float = 0.0
+    # Counts preloaded by the warm-up are served this long (absorbs the
+    # refetches after a restart); skipped for polls in the shared tally store
+    POLL_CACHE_WARMUP_COUNTS_TTL_SECONDS: float = 10.0
+    
     # Debug
     DEBUG: bool = False
+    
+    # Trending
+    TRENDING_HALF_LIFE_HOURS: float = 6.0
+    TRENDING_WINDOW_HOURS: float = 48.0
+    TRENDING_VOTE_WEIGHT: float = 1.0
+    TRENDING_LIKE_WEIGHT: float = 2.0
+    
+    # Admission control (keep in-flight below the DB pool size of 30)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 25
+    ADMISSION_MAX_QUEUE: int = 50
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    
+    # Per-user rate limits
+    VOTE_RATE_PER_SECOND: float = 1.0
+    VOTE_BURST: int = 5
+    LIKE_RATE_PER_SECOND: float = 1.0
+    LIKE_BURST: int = 5
+    
+    # Closed polls
+    CLOSED_POLL_CACHE_SECONDS: int = 31536000
+    # How often each worker looks for polls with a closing time created elsewhere
+    POLL_CLOSE_RESCAN_SECONDS: float = 30.0
+    
+    # Vote compaction for long-inactive polls
+    VOTE_COMPACTION_ENABLED: bool = True
+    VOTE_COMPACTION_AFTER_HOURS: float = 168.0
+    VOTE_COMPACTION_INTERVAL_SECONDS: float = 3600.0
+    VOTE_COMPACTION_BATCH_SIZE: int = 100
+    
+    # Post-commit event dispatch (WebSocket fan-out)
+    EVENT_QUEUE_SIZE: int = 10000
+    EVENT_BATCH_SIZE: int = 256
+    EVENT_DRAIN_TIMEOUT_SECONDS: float = 10.0
+    
+    # Shared-memory tally store (one file per host, shared by all workers)
+    TALLY_STORE_ENABLED: bool = False
+    TALLY_STORE_PATH: str = "/dev/shm/quickpoll-tallies"
+    TALLY_STORE_SLOTS: int = 65536
+    TALLY_STORE_MAX_OPTIONS: int = 16
+    
+    # HTTP response compression (brotli when installed, else gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # WebSocket permessage-deflate (applied when run via `python -m app.main`)
+    WS_DEFLATE_ENABLED: bool = True
+    WS_DEFLATE_SERVER_MAX_WINDOW_BITS: Optional[int] = 12
+    WS_DEFLATE_CLIENT_MAX_WINDOW_BITS: Optional[int] = None
+    WS_DEFLATE_SERVER_NO_CONTEXT_TAKEOVER: bool = False
+    WS_DEFLATE_CLIENT_NO_CONTEXT_TAKEOVER: bool = False
+    WS_DEFLATE_MEM_LEVEL: int = 5
+    
+    # WebSocket drain on shutdown (rolling deploys)
+    WS_DRAIN_DEADLINE_SECONDS: float = 20.0
+    WS_DRAIN_BATCH_SIZE: int = 100
+    WS_DRAIN_BATCH_INTERVAL_SECONDS: float = 0.5
+    WS_RECONNECT_MIN_BACKOFF_SECONDS: float = 1.0
+    WS_RECONNECT_MAX_BACKOFF_SECONDS: float = 30.0
+    WS_RESUME_TOKEN_TTL_SECONDS: int = 300
 
 settings = Settings()
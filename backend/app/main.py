@@ -1,33 +1,92 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import logging
 
 from app.config import settings
 from app.models.database import sessionmanager, Base
+from app.models.migrations import upgrade_schema
 from app.routers import auth, polls, websocket
+from app.services.trending import trending_index
+from app.services.search import ensure_search_index
+from app.services.scheduler import poll_scheduler
+from app.services.compaction import vote_compactor
+from app.services.events import event_dispatcher
+from app.services.tally_store import tally_store
+from app.services.poll_cache import poll_cache
+from app.services.startup import startup
+from app.services.websocket_manager import manager
+from app.utils.compression import CompressionMiddleware
+from app.utils.websocket_protocol import TunedWebSocketProtocol, log_websocket_setup
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+startup.record("import", time.perf_counter() - _import_started)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan events for startup and shutdown."""
     # Startup
     logger.info("Starting up application...")
-    sessionmanager.init_db(settings.DATABASE_URL)
+    startup_started = time.perf_counter()
+    log_websocket_setup()
+    with startup.phase("init_db"):
+        sessionmanager.init_db(settings.DATABASE_URL)
     
-    # Create tables (use Alembic in production)
-    async with sessionmanager.engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Create missing tables and columns (use Alembic in production)
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        with startup.phase("schema_check"):
+            async with sessionmanager.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await upgrade_schema(conn)
+                await ensure_search_index(conn)
     
     logger.info("Database initialized")
     
+    with startup.phase("indexes"):
+        async with sessionmanager.session_factory() as session:
+            await trending_index.rebuild(session)
+            scheduled = await poll_scheduler.load(session)
+            logger.info("Scheduled %s polls for closing", scheduled)
+            if settings.TALLY_STORE_ENABLED and tally_store.open():
+                await tally_store.rebuild(session)
+                tally_store.mark_ready()
+    
+    event_dispatcher.start(polls.handle_poll_events)
+    poll_scheduler.start(polls.close_poll, sessionmanager.session_factory)
+    if settings.VOTE_COMPACTION_ENABLED:
+        vote_compactor.start(sessionmanager.session_factory)
+    
+    # Warm the poll cache in the background; /ready reports 503 until done
+    if settings.WARMUP_ENABLED:
+        startup.start_warmup(poll_cache.preload(
+            sessionmanager.session_factory,
+            settings.WARMUP_POLL_COUNT,
+            trending_index.top(settings.WARMUP_POLL_COUNT),
+            counted_elsewhere=tally_store.tracks,
+        ))
+    else:
+        startup.mark_ready()
+    
+    startup.record("lifespan", time.perf_counter() - startup_started)
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+    await startup.stop()
+    # No-op if the server protocol already drained the sockets
+    await manager.drain()
+    await vote_compactor.stop()
+    await poll_scheduler.stop()
+    await event_dispatcher.drain(settings.EVENT_DRAIN_TIMEOUT_SECONDS)
+    tally_store.close()
     await sessionmanager.close()
 
 app = FastAPI(
@@ -50,6 +109,15 @@ app.add_middleware(
     allow_methods=["*"],              # allow all methods (GET, POST, etc.)
     allow_headers=["*"],              # allow all headers
 )
+
+# Compress large JSON responses (e.g. the 50-poll feed) for metered clients
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
 # Include routers AFTER CORS middleware
 app.include_router(auth.router)
 app.include_router(polls.router)
@@ -63,7 +131,28 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    # Not ready while warming up, nor once draining for shutdown
+    if not startup.ready or not manager.accepting:
+        status = "draining" if startup.ready else "starting"
+        return JSONResponse({"status": status, "phases_ms": startup.timings}, status_code=503)
+    return {"status": "ready", "phases_ms": startup.timings}
+
+@app.get("/metrics/events")
+async def event_metrics():
+    return event_dispatcher.metrics()
+
 if __name__ == "__main__":
     import uvicorn, os
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Custom protocol class applies the WS_DEFLATE_* permessage-deflate settings
+    # and drains sockets gracefully; allow the drain to finish before cancelling
+    TunedWebSocketProtocol.installed = True
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        ws=TunedWebSocketProtocol,
+        timeout_graceful_shutdown=int(settings.WS_DRAIN_DEADLINE_SECONDS) + 5,
+    )
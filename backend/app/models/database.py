@@ -1,25 +1,87 @@
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
 from app.config import settings
 
 Base = declarative_base()
 
+class SQLiteRoutingSession(Session):
+    """Session that sends writes to the single SQLite writer connection.
+
+    Reads go to the read pool until the transaction writes (flush or DML);
+    from then on reads use the writer as well, so they see their own
+    uncommitted changes. The flag resets when the transaction ends.
+    """
+
+    def __init__(self, *args: Any, reader: Engine, writer: Engine, **kw: Any) -> None:
+        super().__init__(*args, **kw)
+        self.reader = reader
+        self.writer = writer
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.wrote or self._flushing or isinstance(clause, UpdateBase):
+            self.wrote = True
+            return self.writer
+        return self.reader
+
+@event.listens_for(SQLiteRoutingSession, "after_transaction_end")
+def _reset_writer_routing(session: SQLiteRoutingSession, transaction) -> None:
+    if transaction.parent is None:
+        session.wrote = False
+
+def _apply_sqlite_pragmas(engine: AsyncEngine, *, immediate: bool) -> None:
+    """Tune every new SQLite connection; writers take the lock up front."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+        cursor.close()
+        if immediate:
+            # Let SQLAlchemy emit BEGIN itself (see the "begin" hook below)
+            dbapi_connection.isolation_level = None
+
+    if immediate:
+        @event.listens_for(engine.sync_engine, "begin")
+        def begin_immediate(conn):
+            # Take the write lock at BEGIN so a deferred read transaction never
+            # fails to upgrade when another process is writing
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
 class DatabaseSessionManager:
     """Manages asynchronous database sessions with connection pooling."""
 
     def __init__(self) -> None:
         self.engine: Optional[AsyncEngine] = None
+        self.read_engine: Optional[AsyncEngine] = None
         self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
     def init_db(self, database_url: str) -> None:
         """Initialize the database engine and session factory."""
+        url = make_url(database_url)
+        if (
+            settings.SQLITE_OPTIMIZED
+            and url.get_backend_name() == "sqlite"
+            and url.database not in (None, "", ":memory:")
+        ):
+            self._init_sqlite(database_url)
+            return
+
         self.engine = create_async_engine(
             database_url,
             poolclass=AsyncAdaptedQueuePool,
@@ -29,16 +91,50 @@ class DatabaseSessionManager:
             pool_recycle=3600,
             echo=settings.DEBUG,
         )
+        self.read_engine = self.engine
+
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            expire_on_commit=False,
+            autoflush=False,
+            class_=AsyncSession,
+        )
+
+    def _init_sqlite(self, database_url: str) -> None:
+        """SQLite mode: one serialized writer connection plus a read pool."""
+        # `engine` is the writer so DDL (create_all) and raw writes go through it
+        self.engine = create_async_engine(
+            database_url,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=settings.SQLITE_WRITE_TIMEOUT_SECONDS,
+            echo=settings.DEBUG,
+        )
+        self.read_engine = create_async_engine(
+            database_url,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.SQLITE_READ_POOL_SIZE,
+            max_overflow=0,
+            echo=settings.DEBUG,
+        )
+        _apply_sqlite_pragmas(self.engine, immediate=True)
+        _apply_sqlite_pragmas(self.read_engine, immediate=False)
 
         self.session_factory = async_sessionmaker(
             self.engine,
             expire_on_commit=False,
             autoflush=False,
             class_=AsyncSession,
+            sync_session_class=SQLiteRoutingSession,
+            reader=self.read_engine.sync_engine,
+            writer=self.engine.sync_engine,
         )
 
     async def close(self) -> None:
         """Dispose of the database engine."""
+        if self.read_engine and self.read_engine is not self.engine:
+            await self.read_engine.dispose()
         if self.engine:
             await self.engine.dispose()
 
@@ -0,0 +1,31 @@
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.models.poll import Poll
+
+logger = logging.getLogger(__name__)
+
+# Columns added to `polls` after its first release. `create_all` creates
+# missing tables but never alters existing ones, so these are added here.
+_ADDED_POLL_COLUMNS = {
+    "closes_at": "",
+    "votes_compacted": " NOT NULL DEFAULT FALSE",
+}
+
+
+async def upgrade_schema(conn: AsyncConnection) -> None:
+    """Add columns missing from tables created by older versions."""
+    existing = await conn.run_sync(
+        lambda sync_conn: {column["name"] for column in inspect(sync_conn).get_columns("polls")}
+    )
+
+    for name, suffix in _ADDED_POLL_COLUMNS.items():
+        if name in existing:
+            continue
+        column_type = Poll.__table__.c[name].type.compile(dialect=conn.dialect)
+        await conn.execute(text(f"ALTER TABLE polls ADD COLUMN {name} {column_type}{suffix}"))
+        logger.info("Added polls.%s column", name)
+
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_polls_closes_at ON polls (closes_at)"))
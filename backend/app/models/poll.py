@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -12,6 +12,8 @@ class Poll(Base):
     creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     is_active = Column(Boolean, default=True)
     allow_multiple_votes = Column(Boolean, default=False)
+    closes_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    votes_compacted = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -56,3 +58,25 @@ class Like(Base):
     # Relationships
     poll = relationship("Poll", back_populates="likes")
     user = relationship("User", back_populates="likes")
+
+class PollResult(Base):
+    """Immutable snapshot of a poll's final tallies, written when it closes."""
+    __tablename__ = "poll_results"
+
+    poll_id = Column(Integer, ForeignKey("polls.id", ondelete="CASCADE"), primary_key=True)
+    payload = Column(JSON, nullable=False)
+    total_votes = Column(Integer, nullable=False)
+    total_likes = Column(Integer, nullable=False)
+    closed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class VoteArchive(Base):
+    """Compact replacement for the `votes` rows of a long-inactive poll."""
+    __tablename__ = "vote_archives"
+
+    poll_id = Column(Integer, ForeignKey("polls.id", ondelete="CASCADE"), primary_key=True)
+    # {option_id: total}
+    option_totals = Column(JSON, nullable=False)
+    # Parallel packed uint32 arrays of (user_id, option_id), sorted by user_id
+    voter_ids = Column(LargeBinary, nullable=False)
+    voter_option_ids = Column(LargeBinary, nullable=False)
+    compacted_at = Column(DateTime(timezone=True), server_default=func.now())
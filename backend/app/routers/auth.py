@@ -7,10 +7,16 @@ from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from app.utils.security import get_password_hash, verify_password, create_access_token
 from app.config import settings
+from app.services.admission import admit_read, admit_write
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_write)],
+)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
     # Check if email exists
@@ -42,7 +48,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     
     return new_user
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(admit_read)])
 async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login and get access token."""
     # Find user
@@ -1,19 +1,36 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
+import logging
+import math
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, update, func, and_
 from sqlalchemy.orm import selectinload
-from app.models.database import get_db
+from app.config import settings
+from app.models.database import get_db, sessionmanager
 from app.models.user import User
-from app.models.poll import Poll, PollOption, Vote, Like
+from app.models.poll import Poll, PollOption, Vote, Like, PollResult, VoteArchive
 from app.schemas.poll import (
-    PollCreate, PollUpdate, PollResponse, PollOptionResponse,
+    PollCreate, PollUpdate, PollResponse,
+    PollSearchResponse,
     VoteCreate, VoteResponse, LikeResponse
 )
 from app.utils.security import decode_token
+from app.utils.responses import FastJSONResponse, to_jsonable
 from app.services.websocket_manager import manager
+from app.services.trending import trending_index
+from app.services.search import search_polls
+from app.services.scheduler import poll_scheduler
+from app.services.compaction import archived_vote_counts, archived_user_options
+from app.services.events import PollEvent, event_dispatcher
+from app.services.tally_store import tally_store
+from app.services.poll_cache import poll_cache
+from app.services.admission import (
+    TokenBucketLimiter, admit_vote, admit_write, admit_read, vote_limiter, like_limiter
+)
 
 router = APIRouter(prefix="/polls", tags=["polls"])
+logger = logging.getLogger(__name__)
 
 async def get_current_user(
     authorization: Optional[str] = Header(None),
@@ -50,7 +67,24 @@ async def get_current_user_required(
         )
     return user
 
-@router.post("/", response_model=PollResponse, status_code=status.HTTP_201_CREATED)
+def rate_limit(limiter: TokenBucketLimiter):
+    """Build a dependency that applies a per-user token bucket."""
+    async def dependency(current_user: User = Depends(get_current_user_required)) -> None:
+        retry_after = limiter.consume(current_user.id)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, slow down",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+    return dependency
+
+@router.post(
+    "/",
+    response_model=PollResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_write)],
+)
 async def create_poll(
     poll_data: PollCreate,
     current_user: User = Depends(get_current_user_required),
@@ -63,12 +97,22 @@ async def create_poll(
             detail="Poll must have at least 2 options"
         )
     
+    closes_at = None
+    if poll_data.closes_at:
+        closes_at = as_utc(poll_data.closes_at)
+        if closes_at <= datetime.now(timezone.utc):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Closing time must be in the future"
+            )
+    
     # Create poll
     new_poll = Poll(
         title=poll_data.title,
         description=poll_data.description,
         creator_id=current_user.id,
-        allow_multiple_votes=poll_data.allow_multiple_votes
+        allow_multiple_votes=poll_data.allow_multiple_votes,
+        closes_at=closes_at
     )
     
     db.add(new_poll)
@@ -82,6 +126,9 @@ async def create_poll(
     await db.commit()
     await db.refresh(new_poll)
     
+    if closes_at:
+        poll_scheduler.schedule(new_poll.id, closes_at)
+    
     # Load relationships
     result = await db.execute(
         select(Poll)
@@ -90,19 +137,18 @@ async def create_poll(
     )
     poll = result.scalar_one()
     
+    tally_store.register_poll(poll.id, [option.id for option in poll.options])
+    poll_cache.put_poll(poll)
+    
     # Format response
-    response = await format_poll_response(poll, current_user.id, db)
+    payload = await format_poll_response(poll, current_user.id, db)
     
     # Broadcast new poll to global listeners with the full payload
-    payload = response.model_dump(mode="json")
-    await manager.broadcast_to_global({
-        "type": "poll_created",
-        "data": payload,
-    })
+    event_dispatcher.emit(PollEvent("poll_created", poll.id, {"poll": payload}, coalesce=False))
     
-    return response
+    return FastJSONResponse(payload, status_code=status.HTTP_201_CREATED)
 
-@router.get("/", response_model=List[PollResponse])
+@router.get("/", response_model=List[PollResponse], dependencies=[Depends(admit_read)])
 async def get_polls(
     skip: int = 0,
     limit: int = 50,
@@ -112,20 +158,84 @@ async def get_polls(
     """Get all polls."""
     current_user = await get_current_user(authorization, db)
     
+    # Only ids here; definitions come from the warm cache where possible
     result = await db.execute(
-        select(Poll)
-        .options(selectinload(Poll.options), selectinload(Poll.creator))
+        select(Poll.id)
         .where(Poll.is_active == True)
         .order_by(Poll.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    polls = result.scalars().all()
+    poll_ids = list(result.scalars().all())
+    polls_by_id = await load_polls(poll_ids, db)
     
     user_id = current_user.id if current_user else None
-    return [await format_poll_response(poll, user_id, db) for poll in polls]
+    return FastJSONResponse([
+        await format_poll_response(polls_by_id[poll_id], user_id, db)
+        for poll_id in poll_ids
+        if poll_id in polls_by_id
+    ])
 
-@router.get("/{poll_id}", response_model=PollResponse)
+@router.get("/trending", response_model=List[PollResponse], dependencies=[Depends(admit_read)])
+async def get_trending_polls(
+    limit: int = Query(10, ge=1, le=50),
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get active polls ranked by recent, time-decayed votes and likes."""
+    current_user = await get_current_user(authorization, db)
+    
+    ranked_ids = trending_index.top(limit)
+    if not ranked_ids:
+        return FastJSONResponse([])
+    
+    polls_by_id = await load_polls(ranked_ids, db)
+    
+    user_id = current_user.id if current_user else None
+    return FastJSONResponse([
+        await format_poll_response(polls_by_id[poll_id], user_id, db)
+        for poll_id in ranked_ids
+        if poll_id in polls_by_id
+        and polls_by_id[poll_id].is_active
+        and not is_past_close(polls_by_id[poll_id])
+    ])
+
+@router.get("/search", response_model=PollSearchResponse, dependencies=[Depends(admit_read)])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over active poll titles and descriptions."""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Search query must not be empty")
+    
+    current_user = await get_current_user(authorization, db)
+    
+    try:
+        hits, next_cursor = await search_polls(db, q, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not hits:
+        return FastJSONResponse({"results": [], "next_cursor": None})
+    
+    polls_by_id = await load_polls([poll_id for poll_id, _ in hits], db)
+    
+    user_id = current_user.id if current_user else None
+    results = []
+    for poll_id, rank in hits:
+        if poll_id not in polls_by_id:
+            continue
+        payload = await format_poll_response(polls_by_id[poll_id], user_id, db)
+        payload["rank"] = rank
+        results.append(payload)
+    
+    return FastJSONResponse({"results": results, "next_cursor": next_cursor})
+
+@router.get("/{poll_id}", response_model=PollResponse, dependencies=[Depends(admit_read)])
 async def get_poll(
     poll_id: int,
     authorization: Optional[str] = Header(None),
@@ -133,21 +243,48 @@ async def get_poll(
 ):
     """Get a specific poll."""
     current_user = await get_current_user(authorization, db)
+    user_id = current_user.id if current_user else None
     
-    result = await db.execute(
-        select(Poll)
-        .options(selectinload(Poll.options), selectinload(Poll.creator))
-        .where(Poll.id == poll_id)
-    )
-    poll = result.scalar_one_or_none()
+    # Cached polls are re-checked against the database, so one closed or
+    # compacted elsewhere falls through to its snapshot below
+    cached = (await get_cached_polls([poll_id], db)).get(poll_id)
+    if cached and not is_past_close(cached):
+        return FastJSONResponse(await format_poll_response(cached, user_id, db))
+    
+    # Closed polls are served from their frozen results snapshot
+    snapshot = await db.get(PollResult, poll_id)
+    if snapshot:
+        if not current_user:
+            return FastJSONResponse(snapshot.payload, headers={
+                "Cache-Control": f"public, max-age={settings.CLOSED_POLL_CACHE_SECONDS}, immutable"
+            })
+        
+        archive = await db.get(VoteArchive, poll_id)
+        user_has_voted, user_voted_option_ids, user_has_liked = await get_user_interaction(
+            poll_id, snapshot.payload["allow_multiple_votes"], current_user.id, db, archive
+        )
+        closed_poll = {
+            **snapshot.payload,
+            "user_has_voted": user_has_voted,
+            "user_has_liked": user_has_liked,
+            "user_voted_options": user_voted_option_ids,
+        }
+        return FastJSONResponse(closed_poll, headers={
+            "Cache-Control": f"private, max-age={settings.CLOSED_POLL_CACHE_SECONDS}"
+        })
+    
+    poll = (await load_polls([poll_id], db)).get(poll_id)
     
     if not poll:
         raise HTTPException(status_code=404, detail="Poll not found")
     
-    user_id = current_user.id if current_user else None
-    return await format_poll_response(poll, user_id, db)
+    return FastJSONResponse(await format_poll_response(poll, user_id, db))
 
-@router.post("/{poll_id}/vote", response_model=VoteResponse)
+@router.post(
+    "/{poll_id}/vote",
+    response_model=VoteResponse,
+    dependencies=[Depends(admit_vote), Depends(rate_limit(vote_limiter))],
+)
 async def vote_on_poll(
     poll_id: int,
     vote_data: VoteCreate,
@@ -162,7 +299,7 @@ async def vote_on_poll(
     if not poll:
         raise HTTPException(status_code=404, detail="Poll not found")
     
-    if not poll.is_active:
+    if not poll.is_active or is_past_close(poll):
         raise HTTPException(status_code=400, detail="Poll is not active")
     
     # Check if option belongs to poll
@@ -196,23 +333,20 @@ async def vote_on_poll(
     await db.commit()
     await db.refresh(new_vote)
     
-    # Get updated vote counts
-    vote_counts = await get_vote_counts(poll_id, db)
+    trending_index.record_vote(poll_id, new_vote.created_at)
+    tally_store.add_vote(poll_id, vote_data.option_id)
+    poll_cache.invalidate_votes(poll_id)
     
-    # Broadcast vote update to all watching this poll
-    await manager.broadcast_to_poll(poll_id, {
-        "type": "vote_update",
-        "data": {
-            "poll_id": poll_id,
-            "option_id": vote_data.option_id,
-            "vote_counts": vote_counts,
-            "total_votes": sum(vote_counts.values())
-        }
-    })
+    # Counting and broadcasting happen in the background
+    event_dispatcher.emit(PollEvent("vote_cast", poll_id, {"option_id": vote_data.option_id}))
     
     return new_vote
 
-@router.post("/{poll_id}/like", response_model=LikeResponse)
+@router.post(
+    "/{poll_id}/like",
+    response_model=LikeResponse,
+    dependencies=[Depends(admit_write), Depends(rate_limit(like_limiter))],
+)
 async def like_poll(
     poll_id: int,
     current_user: User = Depends(get_current_user_required),
@@ -226,6 +360,10 @@ async def like_poll(
     if not poll:
         raise HTTPException(status_code=404, detail="Poll not found")
     
+    # Likes are part of the frozen results once a poll closes
+    if not poll.is_active or is_past_close(poll):
+        raise HTTPException(status_code=400, detail="Poll is not active")
+    
     # Check if already liked
     result = await db.execute(
         select(Like).where(and_(Like.poll_id == poll_id, Like.user_id == current_user.id))
@@ -241,21 +379,19 @@ async def like_poll(
     await db.commit()
     await db.refresh(new_like)
     
-    # Get updated like count
-    like_count = await get_like_count(poll_id, db)
+    trending_index.record_like(poll_id, new_like.created_at)
+    tally_store.add_like(poll_id, 1)
+    poll_cache.invalidate_likes(poll_id)
     
-    # Broadcast like update
-    await manager.broadcast_to_poll(poll_id, {
-        "type": "like_update",
-        "data": {
-            "poll_id": poll_id,
-            "total_likes": like_count
-        }
-    })
+    # Counting and broadcasting happen in the background
+    event_dispatcher.emit(PollEvent("likes_changed", poll_id))
     
     return new_like
 
-@router.delete("/{poll_id}/like")
+@router.delete(
+    "/{poll_id}/like",
+    dependencies=[Depends(admit_write), Depends(rate_limit(like_limiter))],
+)
 async def unlike_poll(
     poll_id: int,
     current_user: User = Depends(get_current_user_required),
@@ -263,33 +399,60 @@ async def unlike_poll(
 ):
     """Unlike a poll."""
     result = await db.execute(
-        select(Like).where(and_(Like.poll_id == poll_id, Like.user_id == current_user.id))
+        select(Like, Poll.is_active)
+        .join(Poll, Poll.id == Like.poll_id)
+        .where(and_(Like.poll_id == poll_id, Like.user_id == current_user.id))
     )
-    like = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not like:
+    if not row:
         raise HTTPException(status_code=404, detail="Like not found")
     
+    like, poll_is_active = row
+    if not poll_is_active:
+        raise HTTPException(status_code=400, detail="Poll is not active")
+    
     await db.delete(like)
     await db.commit()
     
-    # Get updated like count
-    like_count = await get_like_count(poll_id, db)
+    trending_index.remove_like(poll_id, like.created_at)
+    tally_store.add_like(poll_id, -1)
+    poll_cache.invalidate_likes(poll_id)
     
-    # Broadcast like update
-    await manager.broadcast_to_poll(poll_id, {
-        "type": "like_update",
-        "data": {
-            "poll_id": poll_id,
-            "total_likes": like_count
-        }
-    })
+    # Counting and broadcasting happen in the background
+    event_dispatcher.emit(PollEvent("likes_changed", poll_id))
     
     return {"message": "Like removed"}
 
 # Helper functions
 async def get_vote_counts(poll_id: int, db: AsyncSession) -> dict:
     """Get vote counts for all options in a poll."""
+    counts = tally_store.vote_counts(poll_id)
+    if counts is None:
+        counts = poll_cache.vote_counts(poll_id)
+    if counts is not None:
+        return counts
+    
+    version = poll_cache.version(poll_id)
+    counts = await count_votes(poll_id, db)
+    poll_cache.put_vote_counts(poll_id, counts, version)
+    return counts
+
+async def get_like_count(poll_id: int, db: AsyncSession) -> int:
+    """Get like count for a poll."""
+    count = tally_store.like_count(poll_id)
+    if count is None:
+        count = poll_cache.like_count(poll_id)
+    if count is not None:
+        return count
+    
+    version = poll_cache.version(poll_id)
+    count = await count_likes(poll_id, db)
+    poll_cache.put_like_count(poll_id, count, version)
+    return count
+
+async def count_votes(poll_id: int, db: AsyncSession) -> dict:
+    """Count votes per option straight from the database."""
     result = await db.execute(
         select(Vote.option_id, func.count(Vote.id))
         .where(Vote.poll_id == poll_id)
@@ -297,66 +460,250 @@ async def get_vote_counts(poll_id: int, db: AsyncSession) -> dict:
     )
     return {option_id: count for option_id, count in result.all()}
 
-async def get_like_count(poll_id: int, db: AsyncSession) -> int:
-    """Get like count for a poll."""
+async def count_likes(poll_id: int, db: AsyncSession) -> int:
+    """Count likes straight from the database."""
     result = await db.execute(
         select(func.count(Like.id)).where(Like.poll_id == poll_id)
     )
     return result.scalar() or 0
 
-async def format_poll_response(poll: Poll, user_id: Optional[int], db: AsyncSession) -> PollResponse:
-    """Format poll data with vote counts and user interaction status."""
-    vote_counts = await get_vote_counts(poll.id, db)
-    like_count = await get_like_count(poll.id, db)
+async def get_cached_polls(poll_ids: List[int], db: AsyncSession) -> dict:
+    """Cached definitions of polls the database still has active and uncompacted.
     
-    # Check if user has voted
-    user_has_voted = False
-    user_voted_option_ids: List[int] = []
-    if user_id:
+    The cache cannot see a poll closed by another worker or by hand, so its
+    `is_active`/`votes_compacted` flags are confirmed with one query before
+    they decide between live counts, the archive and the snapshot.
+    """
+    polls = poll_cache.get_polls(poll_ids)
+    if not polls:
+        return polls
+    
+    result = await db.execute(
+        select(Poll.id).where(and_(
+            Poll.id.in_(list(polls)),
+            Poll.is_active == True,
+            Poll.votes_compacted == False,
+        ))
+    )
+    current = set(result.scalars().all())
+    for poll_id in list(polls):
+        if poll_id not in current:
+            poll_cache.discard(poll_id)
+            del polls[poll_id]
+    return polls
+
+async def load_polls(poll_ids: List[int], db: AsyncSession) -> dict:
+    """Load polls with their options and creator, from the warm cache where possible."""
+    polls = await get_cached_polls(poll_ids, db)
+    missing = [poll_id for poll_id in poll_ids if poll_id not in polls]
+    if missing:
         result = await db.execute(
-            select(Vote).where(and_(Vote.poll_id == poll.id, Vote.user_id == user_id))
+            select(Poll)
+            .options(selectinload(Poll.options), selectinload(Poll.creator))
+            .where(Poll.id.in_(missing))
         )
-        votes = result.scalars().all()
+        for poll in result.scalars().all():
+            polls[poll.id] = poll_cache.put_poll(poll)
+    return polls
 
-        user_voted_option_ids = [vote.option_id for vote in votes]
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC and normalise aware ones to UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
 
-        if poll.allow_multiple_votes:
-            user_has_voted = len(votes) > 0
-        else:
-            user_has_voted = len(votes) == 1
+def is_past_close(poll: Poll) -> bool:
+    """Whether a poll's closing time has passed (even if not yet closed)."""
+    return poll.closes_at is not None and as_utc(poll.closes_at) <= datetime.now(timezone.utc)
+
+async def get_user_interaction(
+    poll_id: int,
+    allow_multiple_votes: bool,
+    user_id: Optional[int],
+    db: AsyncSession,
+    archive: Optional[VoteArchive] = None
+) -> Tuple[bool, List[int], bool]:
+    """Get whether a user voted (and for which options) and liked a poll."""
+    if not user_id:
+        return False, [], False
     
-    # Check if user has liked
-    user_has_liked = False
-    if user_id:
+    # Check if user has voted
+    if archive:
+        user_voted_option_ids = archived_user_options(archive, user_id)
+    else:
         result = await db.execute(
-            select(Like).where(and_(Like.poll_id == poll.id, Like.user_id == user_id))
+            select(Vote.option_id).where(and_(Vote.poll_id == poll_id, Vote.user_id == user_id))
         )
-        user_has_liked = result.scalar_one_or_none() is not None
+        user_voted_option_ids = list(result.scalars().all())
+
+    if allow_multiple_votes:
+        user_has_voted = len(user_voted_option_ids) > 0
+    else:
+        user_has_voted = len(user_voted_option_ids) == 1
+    
+    # Check if user has liked
+    result = await db.execute(
+        select(Like).where(and_(Like.poll_id == poll_id, Like.user_id == user_id))
+    )
+    user_has_liked = result.scalar_one_or_none() is not None
+    
+    return user_has_voted, user_voted_option_ids, user_has_liked
+
+async def format_poll_response(poll: Poll, user_id: Optional[int], db: AsyncSession) -> dict:
+    """Format poll data with vote counts and user interaction status.
+    
+    Returns a plain dict shaped like `PollResponse`, ready for
+    `FastJSONResponse` or a broadcast, without building Pydantic models.
+    Cached polls must come through `get_cached_polls`/`load_polls`, whose
+    `votes_compacted` flag has been checked against the database.
+    """
+    # Votes of long-inactive polls live in a compact archive row
+    archive = None
+    if poll.votes_compacted:
+        archive = await db.get(VoteArchive, poll.id)
+    
+    if archive:
+        vote_counts = archived_vote_counts(archive)
+    else:
+        vote_counts = await get_vote_counts(poll.id, db)
+    like_count = await get_like_count(poll.id, db)
+    
+    user_has_voted, user_voted_option_ids, user_has_liked = await get_user_interaction(
+        poll.id, poll.allow_multiple_votes, user_id, db, archive
+    )
     
+    return build_poll_payload(
+        poll, vote_counts, like_count, user_has_voted, user_voted_option_ids, user_has_liked
+    )
+
+def build_poll_payload(
+    poll: Poll,
+    vote_counts: dict,
+    like_count: int,
+    user_has_voted: bool,
+    user_voted_option_ids: List[int],
+    user_has_liked: bool
+) -> dict:
+    """Build the `PollResponse`-shaped dict for a poll from its tallies."""
     # Format options with vote counts
     options = [
-        PollOptionResponse(
-            id=opt.id,
-            poll_id=opt.poll_id,
-            text=opt.text,
-            vote_count=vote_counts.get(opt.id, 0)
-        )
+        {
+            "id": opt.id,
+            "poll_id": opt.poll_id,
+            "text": opt.text,
+            "vote_count": vote_counts.get(opt.id, 0),
+        }
         for opt in poll.options
     ]
     
-    return PollResponse(
-        id=poll.id,
-        title=poll.title,
-        description=poll.description,
-        creator_id=poll.creator_id,
-        creator_username=poll.creator.username,
-        is_active=poll.is_active,
-        allow_multiple_votes=poll.allow_multiple_votes,
-        created_at=poll.created_at,
-        options=options,
-        total_votes=sum(vote_counts.values()),
-        total_likes=like_count,
-        user_has_voted=user_has_voted,
-        user_has_liked=user_has_liked,
-        user_voted_options=user_voted_option_ids
-    )
\ No newline at end of file
+    return {
+        "id": poll.id,
+        "title": poll.title,
+        "description": poll.description,
+        "creator_id": poll.creator_id,
+        "creator_username": poll.creator.username,
+        "is_active": poll.is_active,
+        "allow_multiple_votes": poll.allow_multiple_votes,
+        "created_at": poll.created_at,
+        "closes_at": poll.closes_at,
+        "options": options,
+        "total_votes": sum(vote_counts.values()),
+        "total_likes": like_count,
+        "user_has_voted": user_has_voted,
+        "user_has_liked": user_has_liked,
+        "user_voted_options": user_voted_option_ids,
+    }
+
+async def handle_poll_events(events: List[PollEvent]) -> None:
+    """Count and broadcast a batch of committed poll events."""
+    async with sessionmanager.session_factory() as db:
+        for event in events:
+            # One failing event must not hold back the rest of the batch
+            try:
+                await handle_poll_event(event, db)
+            except Exception:
+                logger.exception("Failed to handle %s event for poll %s", event.type, event.poll_id)
+                await db.rollback()
+
+async def handle_poll_event(event: PollEvent, db: AsyncSession) -> None:
+    """Count and broadcast a single committed poll event."""
+    if event.type == "poll_created":
+        await manager.broadcast_to_global({
+            "type": "poll_created",
+            "data": event.data["poll"],
+        })
+    elif event.type == "vote_cast":
+        vote_counts = await get_vote_counts(event.poll_id, db)
+        await manager.broadcast_to_poll(event.poll_id, {
+            "type": "vote_update",
+            "data": {
+                "poll_id": event.poll_id,
+                "option_id": event.data["option_id"],
+                "vote_counts": vote_counts,
+                "total_votes": sum(vote_counts.values())
+            }
+        })
+    elif event.type == "likes_changed":
+        like_count = await get_like_count(event.poll_id, db)
+        await manager.broadcast_to_poll(event.poll_id, {
+            "type": "like_update",
+            "data": {
+                "poll_id": event.poll_id,
+                "total_likes": like_count
+            }
+        })
+    else:
+        logger.warning("Unknown poll event type: %s", event.type)
+
+async def close_poll(poll_id: int) -> None:
+    """Deactivate an expired poll, freeze its final results and notify listeners."""
+    async with sessionmanager.session_factory() as db:
+        # Only one worker wins the update; the others see the committed snapshot
+        result = await db.execute(
+            update(Poll)
+            .where(and_(
+                Poll.id == poll_id,
+                Poll.is_active == True,
+                Poll.closes_at <= datetime.now(timezone.utc),
+            ))
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        
+        if result.rowcount == 1:
+            result = await db.execute(
+                select(Poll)
+                .options(selectinload(Poll.options), selectinload(Poll.creator))
+                .where(Poll.id == poll_id)
+            )
+            poll = result.scalar_one()
+            # Cached and shared-memory counts may lag or drift from the
+            # committed rows; the frozen results are counted from the database
+            final = build_poll_payload(
+                poll,
+                await count_votes(poll_id, db),
+                await count_likes(poll_id, db),
+                False,
+                [],
+                False,
+            )
+            snapshot = PollResult(
+                poll_id=poll_id,
+                payload=to_jsonable(final),
+                total_votes=final["total_votes"],
+                total_likes=final["total_likes"],
+            )
+            db.add(snapshot)
+            await db.commit()
+        else:
+            snapshot = await db.get(PollResult, poll_id)
+            if not snapshot:
+                return
+    
+    trending_index.discard(poll_id)
+    poll_cache.discard(poll_id)
+    
+    await manager.broadcast_to_poll(poll_id, {
+        "type": "poll_closed",
+        "data": snapshot.payload,
+    })
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from typing import Optional
 import logging
-from app.services.websocket_manager import manager
+from app.services.websocket_manager import manager, decode_resume_token
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -9,10 +9,28 @@ logger = logging.getLogger(__name__)
 @router.websocket("/ws")
 async def websocket_endpoint(
     websocket: WebSocket,
-    poll_id: Optional[int] = Query(None)
+    poll_id: Optional[int] = Query(None),
+    resume: Optional[str] = Query(None)
 ):                                                                      
-    """WebSocket endpoint for real-time updates."""
-    await manager.connect(websocket, poll_id)
+    """WebSocket endpoint for real-time updates.
+    
+    Clients reconnecting after a `reconnect` frame pass its `resume_token`
+    as `resume`; a valid token restores the subscription and is answered
+    with a `resumed` frame. Updates sent while the client was away are not
+    replayed, so clients refetch after every reconnect either way.
+    """
+    resumed = decode_resume_token(resume) if resume else None
+    if resumed and poll_id is None:
+        poll_id = resumed["poll_id"]
+    
+    if not await manager.connect(websocket, poll_id):
+        return
+    
+    if resumed:
+        await manager.send_personal_message(
+            {"type": "resumed", "data": {"poll_id": poll_id}},
+            websocket
+        )
     
     try:
         while True:
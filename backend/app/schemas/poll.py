@@ -22,6 +22,7 @@ class PollCreate(BaseModel):
     description: Optional[str] = None
     options: List[str]
     allow_multiple_votes: bool = False
+    closes_at: Optional[datetime] = None
 
 class PollUpdate(BaseModel):
     title: Optional[str] = None
@@ -39,6 +40,7 @@ class PollResponse(BaseModel):
     is_active: bool
     allow_multiple_votes: bool
     created_at: datetime
+    closes_at: Optional[datetime] = None
     options: List[PollOptionResponse]
     total_votes: int = 0
     total_likes: int = 0
@@ -46,6 +48,13 @@ class PollResponse(BaseModel):
     user_has_liked: bool = False
     user_voted_options: List[int] = []
 
+class PollSearchResult(PollResponse):
+    rank: float
+
+class PollSearchResponse(BaseModel):
+    results: List[PollSearchResult]
+    next_cursor: Optional[str] = None
+
 # Vote Schemas
 class VoteCreate(BaseModel):
     option_id: int
@@ -0,0 +1,193 @@
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission classes; lower values are admitted first."""
+
+    VOTE = 0
+    WRITE = 1
+    READ = 2
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted in time."""
+
+
+class AdmissionController:
+    """Bounds in-flight DB-bound requests with a short priority wait queue.
+
+    Requests beyond ``max_in_flight`` wait in a queue of at most ``max_queue``
+    entries for up to ``queue_timeout`` seconds. Freed slots go to the best
+    priority waiting, and a higher-priority arrival may evict the worst queued
+    request when the queue is full, so votes keep flowing while feed reads are
+    shed first.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self.rejected = 0
+        # Entries are (priority, sequence, future); sequence keeps FIFO order
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait for a slot, raising `Overloaded` if none frees up in time."""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue and not self._evict_below(priority):
+            self._reject(priority, "queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (int(priority), next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+
+        try:
+            # The slot is handed over by `release` (in_flight is not decremented)
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.exception():
+                return  # granted at the same moment the wait timed out
+            self._discard(entry)
+            self._reject(priority, "queue timeout")
+        except asyncio.CancelledError:
+            if future.done() and not future.exception():
+                self.release()
+            else:
+                self._discard(entry)
+            raise
+
+    def release(self) -> None:
+        """Free a slot, handing it to the best waiting request if any."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _evict_below(self, priority: Priority) -> bool:
+        """Shed the worst queued request if it ranks below ``priority``."""
+        if not self._waiters:
+            return False
+        worst = max(self._waiters, key=lambda entry: (entry[0], entry[1]))
+        if worst[0] <= priority:
+            return False
+        self._discard(worst)
+        self.rejected += 1
+        worst[2].set_exception(Overloaded("evicted by higher-priority request"))
+        return True
+
+    def _discard(self, entry: Tuple[int, int, asyncio.Future]) -> None:
+        """Remove a specific waiter from the queue."""
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+
+    def _reject(self, priority: Priority, reason: str) -> None:
+        self.rejected += 1
+        logger.warning(
+            "Shedding %s request (%s) | in_flight=%s | queued=%s",
+            priority.name,
+            reason,
+            self.in_flight,
+            len(self._waiters),
+        )
+        raise Overloaded(reason)
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        # key -> (tokens, last refill timestamp)
+        self._buckets: Dict[int, Tuple[float, float]] = {}
+        self._calls = 0
+
+    def consume(self, key: int) -> Optional[float]:
+        """Take one token; returns None if allowed, else seconds until retry."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        self._calls += 1
+        if self._calls % 1024 == 0:
+            self._prune(now)
+
+        if tokens < 1.0:
+            self._buckets[key] = (tokens, now)
+            return (1.0 - tokens) / self.rate
+
+        self._buckets[key] = (tokens - 1.0, now)
+        return None
+
+    def _prune(self, now: float) -> None:
+        """Forget buckets that have refilled completely (same as a new bucket)."""
+        full_after = self.burst / self.rate
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if now - bucket[1] < full_after
+        }
+
+
+admission = AdmissionController(
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
+vote_limiter = TokenBucketLimiter(settings.VOTE_RATE_PER_SECOND, settings.VOTE_BURST)
+like_limiter = TokenBucketLimiter(settings.LIKE_RATE_PER_SECOND, settings.LIKE_BURST)
+
+
+def admit(priority: Priority):
+    """Build a dependency that holds an admission slot for the request."""
+
+    async def dependency() -> AsyncIterator[None]:
+        if not settings.ADMISSION_ENABLED:
+            yield
+            return
+        try:
+            await admission.acquire(priority)
+        except Overloaded:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+        try:
+            yield
+        finally:
+            admission.release()
+
+    return dependency
+
+
+admit_vote = admit(Priority.VOTE)
+admit_write = admit(Priority.WRITE)
+admit_read = admit(Priority.READ)
@@ -0,0 +1,159 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import select, delete, update, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.poll import Poll, Vote, VoteArchive
+
+logger = logging.getLogger(__name__)
+
+# Voter arrays are stored as little-endian uint32
+_TYPECODE = "I"
+
+
+def pack_voters(rows: Iterable[Tuple[int, int]]) -> Tuple[bytes, bytes]:
+    """Pack (user_id, option_id) pairs sorted by user into two parallel arrays."""
+    users = array(_TYPECODE)
+    options = array(_TYPECODE)
+    for user_id, option_id in sorted(rows):
+        users.append(user_id)
+        options.append(option_id)
+    if sys.byteorder == "big":
+        users.byteswap()
+        options.byteswap()
+    return users.tobytes(), options.tobytes()
+
+
+def _unpack(blob: bytes) -> Sequence[int]:
+    """View a packed array without copying it where the byte order allows."""
+    if sys.byteorder == "little":
+        return memoryview(blob).cast(_TYPECODE)
+    values = array(_TYPECODE)
+    values.frombytes(blob)
+    values.byteswap()
+    return values
+
+
+def archived_vote_counts(archive: VoteArchive) -> Dict[int, int]:
+    """Per-option vote totals of a compacted poll."""
+    return {int(option_id): count for option_id, count in archive.option_totals.items()}
+
+
+def archived_user_options(archive: VoteArchive, user_id: int) -> List[int]:
+    """Options a user voted for in a compacted poll (binary search, no DB)."""
+    voters = _unpack(archive.voter_ids)
+    lo = bisect_left(voters, user_id)
+    hi = bisect_right(voters, user_id, lo)
+    if lo == hi:
+        return []
+    return list(_unpack(archive.voter_option_ids)[lo:hi])
+
+
+async def compact_poll(poll_id: int, db: AsyncSession) -> bool:
+    """Move a poll's votes into its archive row and delete the hot rows."""
+    result = await db.execute(
+        update(Poll)
+        .where(and_(Poll.id == poll_id, Poll.is_active == False, Poll.votes_compacted == False))
+        .values(votes_compacted=True)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        await db.rollback()
+        return False
+
+    result = await db.execute(
+        select(Vote.option_id, func.count(Vote.id))
+        .where(Vote.poll_id == poll_id)
+        .group_by(Vote.option_id)
+    )
+    option_totals = {str(option_id): count for option_id, count in result.all()}
+
+    result = await db.execute(
+        select(Vote.user_id, Vote.option_id).where(Vote.poll_id == poll_id)
+    )
+    voter_ids, voter_option_ids = pack_voters(result.all())
+
+    db.add(VoteArchive(
+        poll_id=poll_id,
+        option_totals=option_totals,
+        voter_ids=voter_ids,
+        voter_option_ids=voter_option_ids,
+    ))
+    await db.execute(delete(Vote).where(Vote.poll_id == poll_id))
+    await db.commit()
+    return True
+
+
+class VoteCompactor:
+    """Periodically archives the votes of polls inactive for longer than ``after``."""
+
+    def __init__(self, after_hours: float, interval_seconds: float, batch_size: int) -> None:
+        self.after = timedelta(hours=after_hours)
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start compacting in the background every ``interval`` seconds."""
+        self._session_factory = session_factory
+        self._task = asyncio.create_task(self._run(), name="vote-compactor")
+
+    async def stop(self) -> None:
+        """Cancel the background task."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> int:
+        """Compact one batch of eligible polls; returns how many were compacted."""
+        cutoff = datetime.now(timezone.utc) - self.after
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(Poll.id)
+                .where(and_(
+                    Poll.is_active == False,
+                    Poll.votes_compacted == False,
+                    func.coalesce(Poll.updated_at, Poll.created_at) <= cutoff,
+                ))
+                .limit(self.batch_size)
+            )
+            poll_ids = result.scalars().all()
+
+        compacted = 0
+        for poll_id in poll_ids:
+            async with self._session_factory() as db:
+                if await compact_poll(poll_id, db):
+                    compacted += 1
+
+        if compacted:
+            logger.info("Compacted votes of %s inactive polls", compacted)
+        return compacted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Keep going while full batches come back, then wait
+                while await self.run_once() >= self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("Vote compaction failed")
+            await asyncio.sleep(self.interval)
+
+
+vote_compactor = VoteCompactor(
+    after_hours=settings.VOTE_COMPACTION_AFTER_HOURS,
+    interval_seconds=settings.VOTE_COMPACTION_INTERVAL_SECONDS,
+    batch_size=settings.VOTE_COMPACTION_BATCH_SIZE,
+)
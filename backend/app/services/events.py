@@ -0,0 +1,168 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+import asyncio
+import itertools
+import logging
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollEvent:
+    """Something that happened to a poll, emitted after the DB commit."""
+
+    type: str
+    poll_id: int
+    data: dict = field(default_factory=dict)
+    # A pending event of the same type and poll is replaced by this one
+    coalesce: bool = True
+    emitted_at: float = field(default_factory=time.monotonic)
+
+
+EventHandler = Callable[[List[PollEvent]], Awaitable[None]]
+
+
+class EventDispatcher:
+    """Bounded buffer between request handlers and a background consumer.
+
+    Handlers call `emit` after committing and return straight away. Events
+    are coalesced as they are queued: pending events are keyed by
+    (type, poll_id), and a newer event replaces the pending one for its own
+    key (e.g. many votes on one poll become one broadcast with the latest
+    counts) while keeping its place in line. Events with ``coalesce=False``
+    always get a key of their own. The consumer takes keys in FIFO order and
+    hands each batch to the registered handler, which does the counting and
+    WebSocket fan-out.
+
+    The size limit applies to distinct keys, so it is only reached when the
+    consumer falls behind across that many polls; only then is the oldest
+    pending event dropped.
+    """
+
+    def __init__(self, max_queue: int, max_batch: int) -> None:
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, PollEvent] = {}
+        self._order: Deque[Hashable] = deque()
+        self._sequence = itertools.count()
+        self._ready: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._handler: Optional[EventHandler] = None
+        self._accepting = False
+
+        self.processed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+
+    def start(self, handler: EventHandler) -> None:
+        """Start the background consumer."""
+        self._handler = handler
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._accepting = True
+        self._task = asyncio.create_task(self._run(), name="event-dispatcher")
+
+    def emit(self, event: PollEvent) -> None:
+        """Queue an event without waiting, replacing a pending one with the same key."""
+        if not self._accepting:
+            logger.warning("Dropping %s event for poll %s: dispatcher not running",
+                           event.type, event.poll_id)
+            self.dropped += 1
+            return
+
+        if event.coalesce:
+            key: Hashable = (event.type, event.poll_id)
+        else:
+            key = (event.type, event.poll_id, next(self._sequence))
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Lag is measured from the first event the broadcast stands for
+            event.emitted_at = pending.emitted_at
+            self._pending[key] = event
+            self.coalesced += 1
+            return
+
+        if len(self._order) >= self.max_queue:
+            stale = self._pending.pop(self._order.popleft())
+            self.dropped += 1
+            logger.warning("Event queue full, dropped %s event for poll %s",
+                           stale.type, stale.poll_id)
+
+        self._pending[key] = event
+        self._order.append(key)
+        self._idle.clear()
+        self._ready.set()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting events, flush the queue for up to ``timeout`` seconds, then stop."""
+        if not self._task:
+            return
+
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Event drain timed out with %s events left", len(self._order))
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def metrics(self) -> dict:
+        """Queue depth, throughput and lag (emit to handled) in milliseconds."""
+        return {
+            "queue_depth": len(self._order),
+            "queue_capacity": self.max_queue,
+            "processed": self.processed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "last_lag_ms": round(self.last_lag * 1000, 3),
+            "avg_lag_ms": round(self.avg_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+
+            batch = []
+            while self._order and len(batch) < self.max_batch:
+                batch.append(self._pending.pop(self._order.popleft()))
+            if not self._order:
+                self._ready.clear()
+
+            try:
+                await self._handler(batch)
+            except Exception:
+                logger.exception("Failed to dispatch %s events", len(batch))
+            finally:
+                self._record(batch)
+                if not self._order:
+                    self._idle.set()
+
+    def _record(self, batch: List[PollEvent]) -> None:
+        """Update counters; lag is measured from the oldest event in the batch."""
+        lag = time.monotonic() - min(event.emitted_at for event in batch)
+        self.processed += len(batch)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.avg_lag = lag if self.avg_lag == 0.0 else 0.9 * self.avg_lag + 0.1 * lag
+
+
+event_dispatcher = EventDispatcher(
+    max_queue=settings.EVENT_QUEUE_SIZE,
+    max_batch=settings.EVENT_BATCH_SIZE,
+)
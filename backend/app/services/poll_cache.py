@@ -0,0 +1,277 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.models.poll import Poll, Vote, Like
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedOption:
+    id: int
+    poll_id: int
+    text: str
+
+
+@dataclass(frozen=True)
+class CachedCreator:
+    username: str
+
+
+@dataclass(frozen=True)
+class CachedPoll:
+    """Immutable copy of a poll with its options and creator.
+
+    Has the attributes `build_poll_payload` reads from a `Poll`, but is safe
+    to share between requests: unlike an ORM instance it is never expired
+    by another session's commit or rollback.
+    """
+
+    id: int
+    title: str
+    description: Optional[str]
+    creator_id: int
+    creator: CachedCreator
+    is_active: bool
+    allow_multiple_votes: bool
+    votes_compacted: bool
+    created_at: datetime
+    closes_at: Optional[datetime]
+    options: Tuple[CachedOption, ...]
+
+    @classmethod
+    def from_poll(cls, poll: Poll) -> "CachedPoll":
+        return cls(
+            id=poll.id,
+            title=poll.title,
+            description=poll.description,
+            creator_id=poll.creator_id,
+            creator=CachedCreator(username=poll.creator.username),
+            is_active=poll.is_active,
+            allow_multiple_votes=poll.allow_multiple_votes,
+            votes_compacted=poll.votes_compacted,
+            created_at=poll.created_at,
+            closes_at=poll.closes_at,
+            options=tuple(
+                CachedOption(id=opt.id, poll_id=opt.poll_id, text=opt.text)
+                for opt in poll.options
+            ),
+        )
+
+
+class PollCache:
+    """Per-process LRU of active poll definitions and their vote/like counts.
+
+    Titles, options and creators never change, so definitions stay until
+    evicted or the poll closes on this worker. Their `is_active` and
+    `votes_compacted` flags can change elsewhere (another worker, a manual
+    update), so readers re-check them against the database before trusting
+    them.
+
+    Counts are dropped on every local vote or like and expire after
+    `counts_ttl` seconds, but miss writes handled by other workers until
+    then; at 0 they are not cached, except that the warm-up stores its
+    preloaded counts for `warmup_counts_ttl` seconds to absorb the burst of
+    refetches after a restart. With several workers, enable the shared
+    tally store for exact counts.
+
+    Each poll has a version bumped on invalidation; a count read from the
+    database is only stored if no write landed while it was being read.
+    """
+
+    def __init__(self, max_polls: int, counts_ttl: float, warmup_counts_ttl: float) -> None:
+        self.max_polls = max_polls
+        self.counts_ttl = counts_ttl
+        self.warmup_counts_ttl = warmup_counts_ttl
+
+        self._polls: "OrderedDict[int, CachedPoll]" = OrderedDict()
+        # Count entries are (expires_at, value) on the monotonic clock
+        self._votes: "OrderedDict[int, Tuple[float, Dict[int, int]]]" = OrderedDict()
+        self._likes: "OrderedDict[int, Tuple[float, int]]" = OrderedDict()
+        self._versions: "OrderedDict[int, int]" = OrderedDict()
+
+    def get_polls(self, poll_ids: Iterable[int]) -> Dict[int, CachedPoll]:
+        """Cached definitions for whichever of the ids are present."""
+        found = {}
+        for poll_id in poll_ids:
+            poll = self._polls.get(poll_id)
+            if poll is not None:
+                self._polls.move_to_end(poll_id)
+                found[poll_id] = poll
+        return found
+
+    def put_poll(self, poll: Poll) -> CachedPoll:
+        """Cache a loaded poll (active ones only) and return its snapshot."""
+        cached = CachedPoll.from_poll(poll)
+        if cached.is_active:
+            self._store(self._polls, poll.id, cached)
+        return cached
+
+    def discard(self, poll_id: int) -> None:
+        """Forget a poll entirely (e.g. once it closes)."""
+        self._polls.pop(poll_id, None)
+        self._votes.pop(poll_id, None)
+        self._likes.pop(poll_id, None)
+        self._bump(poll_id)
+
+    def version(self, poll_id: int) -> int:
+        return self._versions.get(poll_id, 0)
+
+    def vote_counts(self, poll_id: int) -> Optional[Dict[int, int]]:
+        """Per-option counts if cached and fresh, else None."""
+        entry = self._votes.get(poll_id)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    def like_count(self, poll_id: int) -> Optional[int]:
+        """Like count if cached and fresh, else None."""
+        entry = self._likes.get(poll_id)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    def put_vote_counts(
+        self, poll_id: int, counts: Dict[int, int], version: int, ttl: Optional[float] = None
+    ) -> None:
+        ttl = self.counts_ttl if ttl is None else ttl
+        if ttl > 0 and self.version(poll_id) == version:
+            self._store(self._votes, poll_id, (time.monotonic() + ttl, counts))
+
+    def put_like_count(
+        self, poll_id: int, count: int, version: int, ttl: Optional[float] = None
+    ) -> None:
+        ttl = self.counts_ttl if ttl is None else ttl
+        if ttl > 0 and self.version(poll_id) == version:
+            self._store(self._likes, poll_id, (time.monotonic() + ttl, count))
+
+    def invalidate_votes(self, poll_id: int) -> None:
+        self._votes.pop(poll_id, None)
+        self._bump(poll_id)
+
+    def invalidate_likes(self, poll_id: int) -> None:
+        self._likes.pop(poll_id, None)
+        self._bump(poll_id)
+
+    async def preload(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        limit: int,
+        hot_ids: List[int],
+        counted_elsewhere: Optional[Callable[[int], bool]] = None,
+    ) -> int:
+        """Load definitions and counts of up to `limit` polls, three queries at once.
+
+        `hot_ids` (e.g. the trending ranking) come first; the rest are the
+        most recently created active polls. Counts are not loaded for polls
+        `counted_elsewhere` (e.g. by the shared tally store), which stay exact.
+        """
+        poll_ids = list(dict.fromkeys(hot_ids))[:limit]
+        if len(poll_ids) < limit:
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(Poll.id)
+                    .where(Poll.is_active == True)
+                    .order_by(Poll.created_at.desc())
+                    .limit(limit)
+                )
+                for poll_id in result.scalars():
+                    if len(poll_ids) >= limit:
+                        break
+                    if poll_id not in poll_ids:
+                        poll_ids.append(poll_id)
+        if not poll_ids:
+            return 0
+
+        versions = {poll_id: self.version(poll_id) for poll_id in poll_ids}
+        count_ids = [
+            poll_id for poll_id in poll_ids
+            if counted_elsewhere is None or not counted_elsewhere(poll_id)
+        ]
+        counts_ttl = max(self.counts_ttl, self.warmup_counts_ttl)
+
+        async def load_polls() -> List[CachedPoll]:
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(Poll)
+                    .options(selectinload(Poll.options), selectinload(Poll.creator))
+                    .where(Poll.id.in_(poll_ids))
+                )
+                return [CachedPoll.from_poll(poll) for poll in result.scalars().all()]
+
+        async def load_votes() -> list:
+            if not count_ids or counts_ttl <= 0:
+                return []
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(Vote.poll_id, Vote.option_id, func.count(Vote.id))
+                    .where(Vote.poll_id.in_(count_ids))
+                    .group_by(Vote.poll_id, Vote.option_id)
+                )
+                return result.all()
+
+        async def load_likes() -> list:
+            if not count_ids or counts_ttl <= 0:
+                return []
+            async with session_factory() as db:
+                result = await db.execute(
+                    select(Like.poll_id, func.count(Like.id))
+                    .where(Like.poll_id.in_(count_ids))
+                    .group_by(Like.poll_id)
+                )
+                return result.all()
+
+        polls, vote_rows, like_rows = await asyncio.gather(
+            load_polls(), load_votes(), load_likes()
+        )
+
+        vote_counts: Dict[int, Dict[int, int]] = {}
+        for poll_id, option_id, count in vote_rows:
+            vote_counts.setdefault(poll_id, {})[option_id] = count
+        like_counts = dict(like_rows)
+
+        counted = set(count_ids) if counts_ttl > 0 else set()
+        with_counts = 0
+        for poll in polls:
+            if not poll.is_active:
+                continue
+            self._store(self._polls, poll.id, poll)
+            if poll.id in counted:
+                version = versions[poll.id]
+                self.put_vote_counts(poll.id, vote_counts.get(poll.id, {}), version, counts_ttl)
+                self.put_like_count(poll.id, like_counts.get(poll.id, 0), version, counts_ttl)
+                with_counts += 1
+
+        logger.info("Poll cache warmed with %s polls (%s with counts)", len(polls), with_counts)
+        return len(polls)
+
+    def _store(self, entries: OrderedDict, poll_id: int, value) -> None:
+        entries[poll_id] = value
+        entries.move_to_end(poll_id)
+        while len(entries) > self.max_polls:
+            entries.popitem(last=False)
+
+    def _bump(self, poll_id: int) -> None:
+        # Kept for more polls than the cache holds so in-flight reads of
+        # recently written polls still see the bump
+        self._versions[poll_id] = self._versions.get(poll_id, 0) + 1
+        self._versions.move_to_end(poll_id)
+        while len(self._versions) > self.max_polls * 4:
+            self._versions.popitem(last=False)
+
+
+poll_cache = PollCache(
+    max_polls=settings.POLL_CACHE_MAX_POLLS,
+    counts_ttl=settings.POLL_CACHE_COUNTS_TTL_SECONDS,
+    warmup_counts_ttl=settings.POLL_CACHE_WARMUP_COUNTS_TTL_SECONDS,
+)
@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+import asyncio
+import heapq
+import logging
+import time
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.poll import Poll
+
+logger = logging.getLogger(__name__)
+
+CloseHandler = Callable[[int], Awaitable[None]]
+
+# How long to wait before retrying a poll whose close handler failed
+_RETRY_DELAY_SECONDS = 30.0
+
+
+class PollCloseScheduler:
+    """Single background task that closes polls when their `closes_at` passes.
+
+    Deadlines live in a min-heap keyed by timestamp; the task sleeps until the
+    earliest one and is woken early whenever a sooner deadline is scheduled.
+    Every worker process runs its own scheduler, so the close handler must
+    be idempotent. Polls created by other workers are picked up by a periodic
+    re-scan for new rows with a closing time.
+    """
+
+    def __init__(self, rescan_seconds: float) -> None:
+        self.rescan_seconds = rescan_seconds
+        self._heap: List[Tuple[float, int]] = []
+        # Polls already in the heap, so re-scans do not queue them twice
+        self._scheduled: Set[int] = set()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._rescan_task: Optional[asyncio.Task] = None
+        self._handler: Optional[CloseHandler] = None
+
+    def schedule(self, poll_id: int, closes_at: datetime) -> None:
+        """Register a poll to be closed at ``closes_at`` (once per poll)."""
+        if poll_id in self._scheduled:
+            return
+        self._scheduled.add(poll_id)
+        if closes_at.tzinfo is None:
+            closes_at = closes_at.replace(tzinfo=timezone.utc)
+        due = closes_at.timestamp()
+
+        heapq.heappush(self._heap, (due, poll_id))
+        if self._heap[0] == (due, poll_id):
+            self._wake.set()
+
+    async def load(self, db: AsyncSession) -> int:
+        """Schedule every active poll that has a closing time; returns how many."""
+        result = await db.execute(
+            select(Poll.id, Poll.closes_at).where(
+                and_(Poll.is_active == True, Poll.closes_at.is_not(None))
+            )
+        )
+        rows = result.all()
+        for poll_id, closes_at in rows:
+            self.schedule(poll_id, closes_at)
+        return len(rows)
+
+    def start(
+        self,
+        handler: CloseHandler,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        """Start the background tasks, calling ``handler`` for each due poll."""
+        self._handler = handler
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="poll-close-scheduler")
+        self._rescan_task = asyncio.create_task(
+            self._rescan(session_factory), name="poll-close-rescan"
+        )
+
+    async def stop(self) -> None:
+        """Cancel the background tasks."""
+        for task in (self._task, self._rescan_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._rescan_task = None
+
+    async def _rescan(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        while True:
+            await asyncio.sleep(self.rescan_seconds)
+            try:
+                async with session_factory() as db:
+                    await self.load(db)
+            except Exception:
+                logger.exception("Failed to re-scan polls for closing times")
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+
+            if not self._heap:
+                await self._wake.wait()
+                continue
+
+            due, poll_id = self._heap[0]
+            delay = due - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            try:
+                await self._handler(poll_id)
+                self._scheduled.discard(poll_id)
+            except Exception:
+                logger.exception("Failed to close poll %s, retrying later", poll_id)
+                heapq.heappush(self._heap, (time.time() + _RETRY_DELAY_SECONDS, poll_id))
+
+
+poll_scheduler = PollCloseScheduler(rescan_seconds=settings.POLL_CLOSE_RESCAN_SECONDS)
@@ -0,0 +1,162 @@
+from typing import List, Optional, Tuple
+import base64
+import json
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# SQLite: external-content FTS5 table kept in sync with `polls` by triggers
+_SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE polls_fts USING fts5(
+        title, description,
+        content='polls', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS polls_fts_ai AFTER INSERT ON polls BEGIN
+        INSERT INTO polls_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS polls_fts_ad AFTER DELETE ON polls BEGIN
+        INSERT INTO polls_fts(polls_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS polls_fts_au AFTER UPDATE OF title, description ON polls BEGIN
+        INSERT INTO polls_fts(polls_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO polls_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+# PostgreSQL: generated tsvector column (always in sync) with a GIN index
+_POSTGRES_FTS_DDL = [
+    """
+    ALTER TABLE polls ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_polls_search_vector ON polls USING GIN (search_vector)",
+]
+
+# Both queries return (id, score) with higher scores ranking first.
+# bm25() is "lower is better", so it is negated; title matches weigh 10x.
+_SQLITE_SEARCH_SQL = """
+    SELECT id, score FROM (
+        SELECT polls.id AS id, -bm25(polls_fts, 10.0, 1.0) AS score
+        FROM polls_fts JOIN polls ON polls.id = polls_fts.rowid
+        WHERE polls_fts MATCH :query AND polls.is_active = 1
+    )
+    WHERE :after_score IS NULL OR score < :after_score
+        OR (score = :after_score AND id > :after_id)
+    ORDER BY score DESC, id ASC
+    LIMIT :limit
+"""
+
+_POSTGRES_SEARCH_SQL = """
+    SELECT id, score FROM (
+        SELECT polls.id AS id,
+               ts_rank_cd(polls.search_vector, websearch_to_tsquery('english', :query))::float8 AS score
+        FROM polls
+        WHERE polls.search_vector @@ websearch_to_tsquery('english', :query)
+            AND polls.is_active = true
+    ) AS hits
+    WHERE CAST(:after_score AS float8) IS NULL OR score < :after_score
+        OR (score = :after_score AND id > :after_id)
+    ORDER BY score DESC, id ASC
+    LIMIT :limit
+"""
+
+
+async def ensure_search_index(conn: AsyncConnection) -> None:
+    """Create the full-text index for the current dialect if it is missing."""
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        result = await conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'polls_fts'")
+        )
+        if result.scalar() is None:
+            await conn.execute(text(_SQLITE_FTS_DDL[0]))
+            # Index any polls that existed before the FTS table
+            await conn.execute(text("INSERT INTO polls_fts(polls_fts) VALUES ('rebuild')"))
+            logger.info("Created FTS5 search index for polls")
+        for statement in _SQLITE_FTS_DDL[1:]:
+            await conn.execute(text(statement))
+    elif dialect == "postgresql":
+        for statement in _POSTGRES_FTS_DDL:
+            await conn.execute(text(statement))
+    else:
+        logger.warning("Full-text poll search is not supported on %s", dialect)
+
+
+def encode_cursor(score: float, poll_id: int) -> str:
+    """Encode a keyset position as an opaque URL-safe token."""
+    raw = json.dumps([score, poll_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a token produced by `encode_cursor`; raises ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, poll_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(poll_id)
+    except Exception as exc:
+        raise ValueError("Invalid search cursor") from exc
+
+
+def _fts5_query(query: str) -> str:
+    """Quote each term so user input cannot inject FTS5 query syntax."""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+async def search_polls(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Tuple[int, float]], Optional[str]]:
+    """Return ranked `(poll_id, score)` hits and the cursor for the next page."""
+    dialect = db.bind.dialect.name
+    after_score, after_id = decode_cursor(cursor) if cursor else (None, None)
+
+    if dialect == "sqlite":
+        sql, query = _SQLITE_SEARCH_SQL, _fts5_query(query)
+    elif dialect == "postgresql":
+        sql = _POSTGRES_SEARCH_SQL
+    else:
+        raise RuntimeError(f"Full-text search is not supported on {dialect}")
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(
+        text(sql),
+        {
+            "query": query,
+            "after_score": after_score,
+            "after_id": after_id,
+            "limit": limit + 1,
+        },
+    )
+    hits = [(poll_id, float(score)) for poll_id, score in result.all()]
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        last_id, last_score = hits[-1]
+        next_cursor = encode_cursor(last_score, last_id)
+
+    return hits, next_cursor
@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Iterator, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTracker:
+    """Times startup phases and tracks whether the worker is ready for traffic.
+
+    The lifespan runs the phases the server cannot start without; the cache
+    warm-up runs in the background afterwards, so `/health` answers at once
+    while `/ready` reports 503 until the warm-up has finished.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.timings: Dict[str, float] = {}
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Store and log how long a phase took."""
+        self.timings[phase] = round(seconds * 1000, 1)
+        logger.info("Startup phase %s took %.1f ms", phase, seconds * 1000)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a startup phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def start_warmup(self, warmup: Awaitable) -> None:
+        """Run the warm-up in the background and mark ready when it ends."""
+        self._warmup_task = asyncio.create_task(self._warm(warmup), name="startup-warmup")
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        logger.info("Worker ready")
+
+    async def stop(self) -> None:
+        """Cancel a warm-up that is still running."""
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+        self._warmup_task = None
+
+    async def _warm(self, warmup: Awaitable) -> None:
+        try:
+            with self.phase("warmup"):
+                await warmup
+        except Exception:
+            # A cold cache is slower, not broken
+            logger.exception("Startup warm-up failed; serving with a cold cache")
+        self.mark_ready()
+
+
+startup = StartupTracker()
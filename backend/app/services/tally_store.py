@@ -0,0 +1,277 @@
+from typing import Dict, Iterable, List, Optional
+import logging
+import mmap
+import os
+import struct
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.poll import Poll, PollOption, Vote, Like
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"QPTALLY2"
+_HEADER = struct.Struct("<8sqq")
+_HEADER_SIZE = 64
+# Number of claimed slots, right after the header fields
+_USED_OFFSET = _HEADER.size
+_WORD = 8
+
+# Keep the table at most 3/4 full and bound every probe sequence, so a
+# lookup for an untracked poll costs O(1) even when the table is full
+_MAX_LOAD = 0.75
+_MAX_PROBE = 64
+
+# Slot fields, in 8-byte words: poll_id (0 = free), likes, option count,
+# then `max_options` option ids followed by `max_options` vote counts
+_POLL_ID, _LIKES, _OPTION_COUNT, _OPTIONS = 0, 1, 2, 3
+
+
+class SharedTallyStore:
+    """Vote and like counters in a memory-mapped file shared by all workers.
+
+    Each poll owns a fixed-size slot in an open-addressed table keyed by poll
+    id. Increments take a POSIX record lock on just that slot, so workers
+    never lose updates; reads are lock-free over 8-byte aligned words.
+
+    The first worker to open the file (no other live process holds it)
+    rebuilds it from the database; later workers reuse its contents. Slots are
+    never freed: once 3/4 of them are used, or a poll's probe sequence is
+    exhausted, new polls are refused and fall back to the database.
+    """
+
+    def __init__(self, path: str, slots: int, max_options: int) -> None:
+        self.path = path
+        self.slots = slots
+        self.max_options = max_options
+        self.slot_size = (_OPTIONS + 2 * max_options) * _WORD
+        self.max_used = int(slots * _MAX_LOAD)
+        self.max_probe = min(_MAX_PROBE, slots)
+
+        self._fd: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._map is not None
+
+    def open(self) -> bool:
+        """Map the shared file; returns True if this process must rebuild it."""
+        if fcntl is None:
+            logger.warning("Shared tally store needs fcntl; falling back to the database")
+            return False
+
+        size = _HEADER_SIZE + self.slots * self.slot_size
+
+        # Held shared for the life of the process: an exclusive lock only
+        # succeeds when no other live worker is using the file. POSIX record
+        # locks (unlike flock) downgrade atomically in `mark_ready`.
+        self._lock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            first = True
+        except OSError:
+            # Blocks until the first worker has finished rebuilding
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_SH)
+            first = False
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if first:
+            # Start from zeroes; `rebuild` fills in the counts
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+        if first:
+            _HEADER.pack_into(self._map, 0, _MAGIC, self.slots, self.max_options)
+            struct.pack_into("<q", self._map, _USED_OFFSET, 0)
+        elif _HEADER.unpack_from(self._map, 0) != (_MAGIC, self.slots, self.max_options):
+            logger.warning("Shared tally store layout mismatch; falling back to the database")
+            self.close()
+            return False
+
+        return first
+
+    def mark_ready(self) -> None:
+        """Let other workers in once this process has finished rebuilding."""
+        if self._lock_fd is not None:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_SH)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Load the most recent active polls and their counts from the database."""
+        active = (
+            select(Poll.id)
+            .where(Poll.is_active == True)
+            .order_by(Poll.created_at.desc())
+            .limit(self.max_used)
+            .subquery()
+        )
+
+        result = await db.execute(
+            select(PollOption.poll_id, PollOption.id)
+            .where(PollOption.poll_id.in_(select(active.c.id)))
+            .order_by(PollOption.poll_id, PollOption.id)
+        )
+        options: Dict[int, List[int]] = {}
+        for poll_id, option_id in result.all():
+            options.setdefault(poll_id, []).append(option_id)
+        for poll_id, option_ids in options.items():
+            self.register_poll(poll_id, option_ids)
+
+        result = await db.execute(
+            select(Vote.poll_id, Vote.option_id, func.count(Vote.id))
+            .where(Vote.poll_id.in_(select(active.c.id)))
+            .group_by(Vote.poll_id, Vote.option_id)
+        )
+        for poll_id, option_id, count in result.all():
+            self.add_vote(poll_id, option_id, count)
+
+        result = await db.execute(
+            select(Like.poll_id, func.count(Like.id))
+            .where(Like.poll_id.in_(select(active.c.id)))
+            .group_by(Like.poll_id)
+        )
+        for poll_id, count in result.all():
+            self.add_like(poll_id, count)
+
+        logger.info("Shared tally store rebuilt with %s polls", len(options))
+
+    def register_poll(self, poll_id: int, option_ids: Iterable[int]) -> bool:
+        """Claim a slot for a poll; returns False if it cannot be tracked."""
+        if not self.enabled:
+            return False
+        option_ids = list(option_ids)
+
+        self._lock(0, _HEADER_SIZE)  # serializes slot allocation across workers
+        try:
+            for offset in self._probe(poll_id):
+                current = self._word(offset, _POLL_ID)
+                if current == poll_id:
+                    return True
+                if current == 0:
+                    used = struct.unpack_from("<q", self._map, _USED_OFFSET)[0]
+                    if used >= self.max_used:
+                        return False
+                    if len(option_ids) > self.max_options:
+                        option_count = -1  # too many options, always read from DB
+                    else:
+                        option_count = len(option_ids)
+                        for index, option_id in enumerate(option_ids):
+                            self._set_word(offset, _OPTIONS + index, option_id)
+                    self._set_word(offset, _OPTION_COUNT, option_count)
+                    # Publish the poll id last so readers never see a partial slot
+                    self._set_word(offset, _POLL_ID, poll_id)
+                    struct.pack_into("<q", self._map, _USED_OFFSET, used + 1)
+                    return True
+            return False
+        finally:
+            self._unlock(0, _HEADER_SIZE)
+
+    def add_vote(self, poll_id: int, option_id: int, count: int = 1) -> None:
+        """Atomically add to an option's vote count."""
+        offset = self._find(poll_id)
+        if offset is None:
+            return
+        index = self._option_index(offset, option_id)
+        if index is None:
+            return
+        self._increment(offset, _OPTIONS + self.max_options + index, count)
+
+    def add_like(self, poll_id: int, delta: int = 1) -> None:
+        """Atomically add to a poll's like count."""
+        offset = self._find(poll_id)
+        if offset is not None:
+            self._increment(offset, _LIKES, delta)
+
+    def vote_counts(self, poll_id: int) -> Optional[Dict[int, int]]:
+        """Per-option counts (options with votes only), or None if not tracked."""
+        offset = self._find(poll_id)
+        if offset is None or self._word(offset, _OPTION_COUNT) < 0:
+            return None
+
+        counts = {}
+        for index in range(self._word(offset, _OPTION_COUNT)):
+            count = self._word(offset, _OPTIONS + self.max_options + index)
+            if count:
+                counts[self._word(offset, _OPTIONS + index)] = count
+        return counts
+
+    def tracks(self, poll_id: int) -> bool:
+        """Whether a poll's vote and like counts are served from the store."""
+        return self.vote_counts(poll_id) is not None
+
+    def like_count(self, poll_id: int) -> Optional[int]:
+        """Like count, or None if the poll is not tracked."""
+        offset = self._find(poll_id)
+        if offset is None:
+            return None
+        return self._word(offset, _LIKES)
+
+    def close(self) -> None:
+        """Unmap the file and release the liveness lock."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        for fd in (self._fd, self._lock_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._lock_fd = None
+
+    def _probe(self, poll_id: int) -> Iterable[int]:
+        """Slot offsets in linear-probing order for a poll id (at most `max_probe`)."""
+        start = (poll_id * 2654435761) % self.slots
+        for step in range(self.max_probe):
+            yield _HEADER_SIZE + ((start + step) % self.slots) * self.slot_size
+
+    def _find(self, poll_id: int) -> Optional[int]:
+        if not self.enabled:
+            return None
+        for offset in self._probe(poll_id):
+            current = self._word(offset, _POLL_ID)
+            if current == poll_id:
+                return offset
+            if current == 0:
+                return None
+        return None
+
+    def _option_index(self, offset: int, option_id: int) -> Optional[int]:
+        for index in range(max(self._word(offset, _OPTION_COUNT), 0)):
+            if self._word(offset, _OPTIONS + index) == option_id:
+                return index
+        return None
+
+    def _increment(self, offset: int, field: int, delta: int) -> None:
+        position = offset + field * _WORD
+        self._lock(position, _WORD)
+        try:
+            value = struct.unpack_from("<q", self._map, position)[0]
+            struct.pack_into("<q", self._map, position, value + delta)
+        finally:
+            self._unlock(position, _WORD)
+
+    def _word(self, offset: int, field: int) -> int:
+        return struct.unpack_from("<q", self._map, offset + field * _WORD)[0]
+
+    def _set_word(self, offset: int, field: int, value: int) -> None:
+        struct.pack_into("<q", self._map, offset + field * _WORD, value)
+
+    def _lock(self, start: int, length: int) -> None:
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+
+    def _unlock(self, start: int, length: int) -> None:
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+
+tally_store = SharedTallyStore(
+    path=settings.TALLY_STORE_PATH,
+    slots=settings.TALLY_STORE_SLOTS,
+    max_options=settings.TALLY_STORE_MAX_OPTIONS,
+)
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import heapq
+import logging
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.poll import Poll, Vote, Like
+
+logger = logging.getLogger(__name__)
+
+# Rebase the decay epoch before 2 ** exponent gets anywhere near float overflow
+_MAX_EXPONENT = 512.0
+
+
+def _to_timestamp(value: Optional[datetime]) -> float:
+    """Convert a DB timestamp to epoch seconds (naive values are UTC)."""
+    if value is None:
+        return time.time()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TrendingIndex:
+    """In-memory ranking of active polls by time-decayed votes and likes.
+
+    Scores use forward decay: an event at time ``t`` contributes
+    ``weight * 2 ** ((t - epoch) / half_life)``. Every score shrinks at the same
+    rate as time passes, so the relative order only changes when an event is
+    recorded and nothing has to be re-scored in the background.
+
+    Ranking is kept in a max-heap with lazy invalidation, so each update is
+    O(log n) and a top-K read only touches K entries. The index is per process
+    and is rebuilt from the database on startup.
+    """
+
+    def __init__(
+        self,
+        half_life_hours: float,
+        window_hours: float,
+        vote_weight: float,
+        like_weight: float,
+    ) -> None:
+        self.half_life = half_life_hours * 3600
+        self.window = timedelta(hours=window_hours)
+        self.vote_weight = vote_weight
+        self.like_weight = like_weight
+
+        self._epoch = time.time()
+        self._scores: Dict[int, float] = {}
+        # Entries are (-score, poll_id); stale ones are skipped on read
+        self._heap: List[Tuple[float, int]] = []
+        self._top_cache: Optional[Tuple[int, List[int]]] = None
+
+    def record_vote(self, poll_id: int, at: Optional[datetime] = None) -> None:
+        """Account for a new vote on a poll."""
+        self._bump(poll_id, self.vote_weight * self._decay_factor(_to_timestamp(at)))
+
+    def record_like(self, poll_id: int, at: Optional[datetime] = None) -> None:
+        """Account for a new like on a poll."""
+        self._bump(poll_id, self.like_weight * self._decay_factor(_to_timestamp(at)))
+
+    def remove_like(self, poll_id: int, liked_at: Optional[datetime]) -> None:
+        """Withdraw the contribution of a like that has been removed."""
+        if poll_id not in self._scores:
+            return
+        self._bump(poll_id, -self.like_weight * self._decay_factor(_to_timestamp(liked_at)))
+
+    def discard(self, poll_id: int) -> None:
+        """Drop a poll from the ranking (e.g. once it is no longer active)."""
+        if self._scores.pop(poll_id, None) is not None:
+            self._top_cache = None
+
+    def top(self, k: int) -> List[int]:
+        """Return the ids of the ``k`` highest-scoring polls, best first."""
+        if self._top_cache is not None and self._top_cache[0] >= k:
+            return self._top_cache[1][:k]
+
+        popped: List[Tuple[float, int]] = []
+        result: List[int] = []
+        while self._heap and len(result) < k:
+            entry = heapq.heappop(self._heap)
+            if self._scores.get(entry[1]) != -entry[0] or entry[1] in result:
+                continue  # superseded by a later update, or a duplicate
+            popped.append(entry)
+            result.append(entry[1])
+
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+
+        self._top_cache = (k, result)
+        return result
+
+    def score(self, poll_id: int) -> float:
+        """Current decayed score of a poll (0 if it is not ranked)."""
+        raw = self._scores.get(poll_id, 0.0)
+        return raw / self._decay_factor(time.time()) if raw else 0.0
+
+    def clear(self) -> None:
+        """Reset the index to an empty state."""
+        self._epoch = time.time()
+        self._scores.clear()
+        self._heap.clear()
+        self._top_cache = None
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reload scores from recent votes and likes on active polls."""
+        self.clear()
+        cutoff = datetime.now(timezone.utc) - self.window
+        active_polls = select(Poll.id).where(Poll.is_active == True)
+
+        for model, weight in ((Vote, self.vote_weight), (Like, self.like_weight)):
+            rows = await db.stream(
+                select(model.poll_id, model.created_at).where(
+                    model.created_at >= cutoff,
+                    model.poll_id.in_(active_polls),
+                )
+            )
+            async for poll_id, created_at in rows:
+                contribution = weight * self._decay_factor(_to_timestamp(created_at))
+                self._scores[poll_id] = self._scores.get(poll_id, 0.0) + contribution
+
+        self._rebuild_heap()
+        logger.info("Trending index rebuilt with %s polls", len(self._scores))
+
+    def _bump(self, poll_id: int, delta: float) -> None:
+        """Apply a score change and push the new value onto the heap."""
+        new_score = self._scores.get(poll_id, 0.0) + delta
+        if new_score <= 1e-9 * abs(delta):
+            self._scores.pop(poll_id, None)
+        else:
+            self._scores[poll_id] = new_score
+            heapq.heappush(self._heap, (-new_score, poll_id))
+
+        self._top_cache = None
+        if len(self._heap) > 2 * len(self._scores) + 64:
+            self._rebuild_heap()
+
+    def _decay_factor(self, at: float) -> float:
+        """Forward-decay multiplier for an event at ``at`` (epoch seconds)."""
+        exponent = (at - self._epoch) / self.half_life
+        if exponent > _MAX_EXPONENT:
+            self._rebase(int(exponent))
+            exponent = (at - self._epoch) / self.half_life
+        return 2.0 ** exponent
+
+    def _rebase(self, shift: int) -> None:
+        """Move the epoch forward by ``shift`` half-lives, rescaling all scores."""
+        factor = 2.0 ** -shift
+        self._epoch += shift * self.half_life
+        self._scores = {
+            poll_id: score * factor
+            for poll_id, score in self._scores.items()
+            if score * factor > 0.0
+        }
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        """Recreate the heap from live scores, discarding stale entries."""
+        self._heap = [(-score, poll_id) for poll_id, score in self._scores.items()]
+        heapq.heapify(self._heap)
+        self._top_cache = None
+
+
+trending_index = TrendingIndex(
+    half_life_hours=settings.TRENDING_HALF_LIFE_HOURS,
+    window_hours=settings.TRENDING_WINDOW_HOURS,
+    vote_weight=settings.TRENDING_VOTE_WEIGHT,
+    like_weight=settings.TRENDING_LIKE_WEIGHT,
+)
@@ -1,14 +1,47 @@
-from typing import Dict, Optional, Set
+from datetime import timedelta
+from typing import Dict, List, Optional, Set, Tuple
 from fastapi import WebSocket
+import asyncio
 import logging
+import math
+import random
+
+from app.config import settings
+from app.utils.responses import dump_json
+from app.utils.security import create_access_token, decode_token
 
 logger = logging.getLogger(__name__)
 
+# Close code sent to drained sockets: "Service Restart"
+SERVICE_RESTART = 1012
+
+
+def create_resume_token(poll_id: Optional[int]) -> str:
+    """Signed token a drained client passes back as `/ws?resume=...`."""
+    return create_access_token(
+        {"type": "ws_resume", "poll_id": poll_id},
+        expires_delta=timedelta(seconds=settings.WS_RESUME_TOKEN_TTL_SECONDS),
+    )
+
+
+def decode_resume_token(token: str) -> Optional[dict]:
+    """Return the resume token payload, or None if invalid or expired."""
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "ws_resume":
+        return None
+    return payload
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        drain_deadline: float = 20.0,
+        drain_batch_size: int = 100,
+        drain_batch_interval: float = 0.5,
+        reconnect_backoff: Tuple[float, float] = (1.0, 30.0),
+    ) -> None:
         # Connections that subscribe to a specific poll
         self.poll_connections: Dict[int, Set[WebSocket]] = {}
         # Connections that subscribe to global updates (e.g. poll list page)
@@ -16,8 +49,20 @@ class ConnectionManager:
         # Map each connection to its poll subscription (None for global)
         self.connection_map: Dict[WebSocket, Optional[int]] = {}
 
-    async def connect(self, websocket: WebSocket, poll_id: Optional[int] = None) -> None:
-        """Accept a new WebSocket connection."""
+        self.drain_deadline = drain_deadline
+        self.drain_batch_size = drain_batch_size
+        self.drain_batch_interval = drain_batch_interval
+        self.reconnect_backoff = reconnect_backoff
+        # False once draining has started; new connections are refused
+        self.accepting = True
+        self._drain_task: Optional[asyncio.Task] = None
+
+    async def connect(self, websocket: WebSocket, poll_id: Optional[int] = None) -> bool:
+        """Accept a new WebSocket connection; returns False if refused while draining."""
+        if not self.accepting:
+            await websocket.close(code=SERVICE_RESTART)
+            return False
+
         await websocket.accept()
 
         self.connection_map[websocket] = poll_id
@@ -28,6 +73,7 @@ class ConnectionManager:
             self.poll_connections.setdefault(poll_id, set()).add(websocket)
 
         self._log_state("Connected", poll_id)
+        return True
 
     def disconnect(self, websocket: WebSocket, poll_id: Optional[int] = None) -> None:
         """Remove a WebSocket connection."""
@@ -59,16 +105,89 @@ class ConnectionManager:
         """Broadcast a message only to global listeners."""
         await self._broadcast(set(self.global_connections), message, context="global")
 
+    def begin_drain(self) -> asyncio.Task:
+        """Stop accepting connections and start draining in the background (idempotent)."""
+        if self._drain_task is None:
+            self.accepting = False
+            self._drain_task = asyncio.create_task(self._drain(), name="websocket-drain")
+        return self._drain_task
+
+    async def drain(self) -> None:
+        """Drain all connections and wait until done (or the deadline passes)."""
+        await self.begin_drain()
+
+    async def _drain(self) -> None:
+        """Send each client a reconnect hint and close it, in paced batches.
+
+        Batches start `drain_batch_interval` apart on a fixed schedule (time
+        spent sending does not push later batches back) and are grown as
+        needed so the last one starts within 80% of `drain_deadline`, leaving
+        the rest for it to be sent. Each client is told to wait a random
+        backoff before reconnecting, so reconnects (and the refetches that
+        follow) spread out over the next instance.
+        """
+        connections: List[WebSocket] = list(self.connection_map)
+        if not connections:
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.drain_deadline
+        max_batches = int(self.drain_deadline * 0.8 / self.drain_batch_interval) + 1
+        batch_size = max(self.drain_batch_size, math.ceil(len(connections) / max_batches))
+        logger.info(
+            "Draining %s WebSocket connections in batches of %s",
+            len(connections),
+            batch_size,
+        )
+
+        for index, start in enumerate(range(0, len(connections), batch_size)):
+            delay = started + index * self.drain_batch_interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            batch = connections[start:start + batch_size]
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(self._send_reconnect(ws) for ws in batch)),
+                    timeout=max(deadline - loop.time(), 0),
+                )
+            except asyncio.TimeoutError:
+                logger.warning("WebSocket drain deadline passed; leaving the rest to the server")
+                break
+
+        self._log_state("Drained", None)
+
+    async def _send_reconnect(self, websocket: WebSocket) -> None:
+        """Send one client its reconnect hint, then close it."""
+        poll_id = self.connection_map.get(websocket)
+        low, high = self.reconnect_backoff
+        message = {
+            "type": "reconnect",
+            "data": {
+                "retry_after_ms": int(random.uniform(low, high) * 1000),
+                "resume_token": create_resume_token(poll_id),
+            },
+        }
+        try:
+            await websocket.send_text(dump_json(message).decode())
+            await websocket.close(code=SERVICE_RESTART)
+        except Exception as exc:  # pragma: no cover - network errors
+            logger.debug("Error draining connection: %s", exc)
+        finally:
+            self._remove_connection(websocket)
+
     async def _broadcast(self, connections: Set[WebSocket], message: dict, *, context: str) -> None:
         """Broadcast helper that gracefully cleans up stale connections."""
         if not connections:
             return
 
+        # Encode once for the whole audience rather than once per socket
+        text = dump_json(message).decode()
         disconnected: Set[WebSocket] = set()
 
         for connection in list(connections):
             try:
-                await connection.send_json(message)
+                await connection.send_text(text)
             except Exception as exc:  # pragma: no cover - network errors
                 logger.error("Error broadcasting to %s: %s", context, exc)
                 disconnected.add(connection)
@@ -106,4 +225,12 @@ class ConnectionManager:
         )
 
 
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager(
+    drain_deadline=settings.WS_DRAIN_DEADLINE_SECONDS,
+    drain_batch_size=settings.WS_DRAIN_BATCH_SIZE,
+    drain_batch_interval=settings.WS_DRAIN_BATCH_INTERVAL_SECONDS,
+    reconnect_backoff=(
+        settings.WS_RECONNECT_MIN_BACKOFF_SECONDS,
+        settings.WS_RECONNECT_MAX_BACKOFF_SECONDS,
+    ),
+)
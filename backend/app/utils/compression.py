@@ -0,0 +1,135 @@
+from typing import List, Optional
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header, preferring brotli."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """Compress complete HTTP responses with brotli or gzip above a size threshold.
+
+    Only single-message (non-streaming) bodies of JSON or text responses are
+    compressed; anything else passes through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+
+def websocket_deflate_extensions() -> List[ServerPerMessageDeflateFactory]:
+    """permessage-deflate offer for /ws built from the WS_DEFLATE_* settings."""
+    if not settings.WS_DEFLATE_ENABLED:
+        return []
+    return [
+        ServerPerMessageDeflateFactory(
+            server_no_context_takeover=settings.WS_DEFLATE_SERVER_NO_CONTEXT_TAKEOVER,
+            client_no_context_takeover=settings.WS_DEFLATE_CLIENT_NO_CONTEXT_TAKEOVER,
+            server_max_window_bits=settings.WS_DEFLATE_SERVER_MAX_WINDOW_BITS,
+            client_max_window_bits=settings.WS_DEFLATE_CLIENT_MAX_WINDOW_BITS,
+            compress_settings={"memLevel": settings.WS_DEFLATE_MEM_LEVEL},
+        )
+    ]
+
+
+
+def describe_deflate_offer() -> str:
+    """Human-readable summary of the WS_DEFLATE_* offer, for startup logs."""
+    if not settings.WS_DEFLATE_ENABLED:
+        return "disabled"
+    return (
+        f"server_max_window_bits={settings.WS_DEFLATE_SERVER_MAX_WINDOW_BITS or 15} "
+        f"client_max_window_bits={settings.WS_DEFLATE_CLIENT_MAX_WINDOW_BITS or 'client default'} "
+        f"server_no_context_takeover={settings.WS_DEFLATE_SERVER_NO_CONTEXT_TAKEOVER} "
+        f"client_no_context_takeover={settings.WS_DEFLATE_CLIENT_NO_CONTEXT_TAKEOVER} "
+        f"memLevel={settings.WS_DEFLATE_MEM_LEVEL}"
+    )
@@ -0,0 +1,27 @@
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+# Non-string keys cover vote_counts ({option_id: count}); UTC as "Z" matches Pydantic
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dump_json(content: Any) -> bytes:
+    """Encode plain dicts/lists (datetimes included) to JSON bytes."""
+    return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def to_jsonable(content: Any) -> Any:
+    """Round-trip through JSON so the result only holds JSON-native types."""
+    return orjson.loads(dump_json(content))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Return it directly from a route to bypass FastAPI's `response_model`
+    validation; the content must already match the declared schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
@@ -0,0 +1,49 @@
+import logging
+
+from uvicorn.protocols.websockets.websockets_impl import WebSocketProtocol
+
+from app.services.websocket_manager import manager
+from app.utils.compression import describe_deflate_offer, websocket_deflate_extensions
+
+logger = logging.getLogger(__name__)
+
+
+class TunedWebSocketProtocol(WebSocketProtocol):
+    """uvicorn's websockets protocol with our deflate settings and a graceful drain.
+
+    uvicorn only exposes an on/off switch for permessage-deflate, and on
+    shutdown it closes every open socket at once, before the lifespan
+    shutdown runs. Pass this class as ``uvicorn.run(..., ws=TunedWebSocketProtocol)``
+    to apply the WS_DEFLATE_* settings and leave established sockets to
+    `ConnectionManager.drain`, which sends reconnect hints and closes them
+    in paced batches.
+    """
+
+    # Set by `python -m app.main` before starting uvicorn with this class
+    installed = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.available_extensions = websocket_deflate_extensions()
+
+    def shutdown(self) -> None:
+        if not self.handshake_completed_event.is_set() or self.closed_event.is_set():
+            super().shutdown()
+            return
+
+        # Keep the socket open; uvicorn waits for it to close before finishing
+        self.ws_server.closing = True
+        manager.begin_drain()
+
+
+def log_websocket_setup() -> None:
+    """Log at startup which deflate offer and drain behaviour are in effect."""
+    if TunedWebSocketProtocol.installed:
+        logger.info("WebSocket permessage-deflate offer: %s", describe_deflate_offer())
+        logger.info("WebSocket graceful drain enabled (deadline %ss)", manager.drain_deadline)
+    else:
+        logger.warning(
+            "WebSocket graceful drain and WS_DEFLATE_* settings are inactive: uvicorn "
+            "closes every socket at shutdown and uses its default permessage-deflate "
+            "offer. Start the server with `python -m app.main` to enable them."
+        )
@@ -0,0 +1,119 @@
+"""Benchmark: CPU cost against bytes saved when compressing poll payloads.
+
+HTTP: the `GET /polls` feed (as serialized by the API) compressed with gzip
+and, when installed, brotli at several levels.
+
+WebSocket: a stream of `vote_update` frames compressed the way
+permessage-deflate does it (raw deflate, sync flush per message) for several
+window sizes, with and without context takeover.
+
+Run from the backend directory:
+
+    python -m benchmarks.compression [--polls 50] [--options 4] [--rounds 500] [--frames 2000]
+"""
+from typing import Callable, List
+import argparse
+import gzip
+import os
+import random
+import time
+import zlib
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.routers.polls import build_poll_payload
+from app.utils.compression import brotli
+from app.utils.responses import dump_json
+from benchmarks.serialization import make_feed
+
+
+def report(label: str, raw: int, compress: Callable[[], int], rounds: int) -> None:
+    compress()  # warm up
+    start = time.process_time()
+    for _ in range(rounds):
+        size = compress()
+    per_call = (time.process_time() - start) / rounds * 1e6
+    saved = 100 * (1 - size / raw)
+    print(f"{label:<22} {per_call:9.1f} us CPU  {size:8} bytes  {saved:5.1f}% saved")
+
+
+def bench_feed(polls: int, options: int, rounds: int) -> None:
+    body = dump_json([build_poll_payload(*entry) for entry in make_feed(polls, options)])
+    print(f"\nGET /polls feed: {polls} polls x {options} options, {len(body)} bytes raw")
+
+    for level in (1, 6, 9):
+        report(f"gzip level {level}", len(body),
+               lambda: len(gzip.compress(body, compresslevel=level, mtime=0)), rounds)
+    if brotli is None:
+        print("brotli not installed, skipping")
+        return
+    for quality in (1, 4, 11):
+        report(f"brotli quality {quality}", len(body),
+               lambda: len(brotli.compress(body, quality=quality)), rounds)
+
+
+def vote_frames(count: int, options: int) -> List[bytes]:
+    """Successive vote_update messages for a handful of busy polls."""
+    rng = random.Random(0)
+    counts = {poll_id: {poll_id * 10 + n: 0 for n in range(options)} for poll_id in range(1, 6)}
+    frames = []
+    for _ in range(count):
+        poll_id = rng.randint(1, 5)
+        option_id = rng.choice(list(counts[poll_id]))
+        counts[poll_id][option_id] += 1
+        frames.append(dump_json({
+            "type": "vote_update",
+            "data": {
+                "poll_id": poll_id,
+                "option_id": option_id,
+                "vote_counts": counts[poll_id],
+                "total_votes": sum(counts[poll_id].values()),
+            },
+        }))
+    return frames
+
+
+def deflate_stream(frames: List[bytes], window_bits: int, takeover: bool, mem_level: int) -> int:
+    """Total compressed size of a frame stream, as permessage-deflate sends it."""
+    def new_encoder():
+        return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -window_bits, mem_level)
+
+    encoder = new_encoder()
+    total = 0
+    for frame in frames:
+        if not takeover:
+            encoder = new_encoder()
+        data = encoder.compress(frame) + encoder.flush(zlib.Z_SYNC_FLUSH)
+        # The 00 00 ff ff sync-flush tail is stripped on the wire
+        total += len(data) - 4
+    return total
+
+
+def bench_websocket(count: int, options: int, rounds: int) -> None:
+    frames = vote_frames(count, options)
+    raw = sum(len(frame) for frame in frames)
+    print(f"\n/ws vote_update stream: {count} frames, {raw} bytes raw "
+          f"(CPU is per {count} frames)")
+
+    for window_bits, mem_level in ((15, 8), (12, 5), (10, 4)):
+        for takeover in (True, False):
+            label = f"wbits {window_bits} {'takeover' if takeover else 'no takeover'}"
+            report(label, raw,
+                   lambda: deflate_stream(frames, window_bits, takeover, mem_level), rounds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--options", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    bench_feed(args.polls, args.options, args.rounds)
+    bench_websocket(args.frames, args.options, max(args.rounds // 50, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Micro-benchmark: CPU time to serialize a poll feed.
+
+Compares the previous path (PollResponse/PollOptionResponse objects, then
+FastAPI re-validating them against `response_model` and encoding with the
+stdlib json module) with the plain-dict + orjson fast path.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization [--polls 50] [--options 4] [--rounds 2000]
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.routers.polls import build_poll_payload
+from app.schemas.poll import PollOptionResponse, PollResponse
+from app.utils.responses import FastJSONResponse
+
+
+def make_feed(polls: int, options: int) -> list:
+    """Build ORM-like poll objects with their tallies."""
+    now = datetime.now(timezone.utc)
+    feed = []
+    for poll_id in range(1, polls + 1):
+        poll = SimpleNamespace(
+            id=poll_id,
+            title=f"Poll number {poll_id}: which option is best?",
+            description="A reasonably sized description for a typical poll. " * 3,
+            creator_id=1,
+            creator=SimpleNamespace(username="creator"),
+            is_active=True,
+            allow_multiple_votes=False,
+            created_at=now,
+            closes_at=None,
+            options=[
+                SimpleNamespace(id=poll_id * 10 + n, poll_id=poll_id, text=f"Option {n}")
+                for n in range(options)
+            ],
+        )
+        vote_counts = {opt.id: 100 + n for n, opt in enumerate(poll.options)}
+        feed.append((poll, vote_counts, 42, True, [poll.options[0].id], False))
+    return feed
+
+
+def serialize_before(feed: list, adapter: TypeAdapter) -> bytes:
+    """Pydantic objects, response_model validation, stdlib JSON encoding."""
+    responses: List[PollResponse] = []
+    for poll, vote_counts, like_count, has_voted, voted_ids, has_liked in feed:
+        options = [
+            PollOptionResponse(
+                id=opt.id,
+                poll_id=opt.poll_id,
+                text=opt.text,
+                vote_count=vote_counts.get(opt.id, 0),
+            )
+            for opt in poll.options
+        ]
+        responses.append(PollResponse(
+            id=poll.id,
+            title=poll.title,
+            description=poll.description,
+            creator_id=poll.creator_id,
+            creator_username=poll.creator.username,
+            is_active=poll.is_active,
+            allow_multiple_votes=poll.allow_multiple_votes,
+            created_at=poll.created_at,
+            closes_at=poll.closes_at,
+            options=options,
+            total_votes=sum(vote_counts.values()),
+            total_likes=like_count,
+            user_has_voted=has_voted,
+            user_has_liked=has_liked,
+            user_voted_options=voted_ids,
+        ))
+    # What FastAPI does with a returned value and a response_model
+    validated = adapter.validate_python(responses, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return JSONResponse(content).body
+
+
+def serialize_after(feed: list) -> bytes:
+    """Plain dicts encoded straight to JSON with orjson."""
+    return FastJSONResponse([build_poll_payload(*entry) for entry in feed]).body
+
+
+def measure(label: str, func, rounds: int) -> float:
+    func()  # warm up
+    start = time.process_time()
+    for _ in range(rounds):
+        body = func()
+    per_request = (time.process_time() - start) / rounds * 1e6
+    print(f"{label:<8} {per_request:10.1f} us CPU/request  ({len(body)} bytes)")
+    return per_request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--options", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    feed = make_feed(args.polls, args.options)
+    adapter = TypeAdapter(List[PollResponse])
+
+    print(f"Feed of {args.polls} polls x {args.options} options, {args.rounds} rounds")
+    before = measure("before", lambda: serialize_before(feed, adapter), args.rounds)
+    after = measure("after", lambda: serialize_after(feed), args.rounds)
+    print(f"speedup  {before / after:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: vote throughput on SQLite under concurrent load.
+
+Runs the same read-then-write pattern as `vote_on_poll` from many concurrent
+tasks against a fresh database file, once with the default engine setup and
+once with the SQLite mode (WAL, tuned pragmas, single writer + read pool),
+and reports committed votes per second and failed votes ("database is locked").
+
+Run from the backend directory:
+
+    python -m benchmarks.sqlite_votes [--concurrency 50] [--votes 40]
+"""
+from typing import Tuple
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import select, and_
+
+from app.config import settings
+from app.models.database import Base, DatabaseSessionManager
+from app.models.poll import Poll, PollOption, Vote
+from app.models.user import User
+
+
+async def seed(manager: DatabaseSessionManager, users: int) -> Tuple[int, int]:
+    """Create users and a multi-vote poll; returns (poll_id, option_id)."""
+    async with manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with manager.session_factory() as db:
+        db.add_all([
+            User(email=f"user{n}@example.com", username=f"user{n}", hashed_password="x")
+            for n in range(users)
+        ])
+        poll = Poll(title="Benchmark", creator_id=1, allow_multiple_votes=True)
+        db.add(poll)
+        await db.flush()
+        option = PollOption(poll_id=poll.id, text="A")
+        db.add(option)
+        await db.commit()
+        return poll.id, option.id
+
+
+async def cast_vote(manager: DatabaseSessionManager, poll_id: int, option_id: int, user_id: int) -> None:
+    """Same queries and commit as the vote endpoint."""
+    async with manager.session_factory() as db:
+        poll = (await db.execute(select(Poll).where(Poll.id == poll_id))).scalar_one()
+        await db.execute(
+            select(PollOption).where(and_(PollOption.id == option_id, PollOption.poll_id == poll.id))
+        )
+        await db.execute(
+            select(Vote).where(and_(Vote.poll_id == poll_id, Vote.user_id == user_id)).limit(1)
+        )
+        db.add(Vote(poll_id=poll_id, option_id=option_id, user_id=user_id))
+        await db.commit()
+
+
+async def run(optimized: bool, concurrency: int, votes: int) -> None:
+    settings.SQLITE_OPTIMIZED = optimized
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DatabaseSessionManager()
+        manager.init_db(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        poll_id, option_id = await seed(manager, concurrency)
+
+        failures = 0
+
+        async def worker(user_id: int) -> int:
+            ok = 0
+            for _ in range(votes):
+                try:
+                    await cast_vote(manager, poll_id, option_id, user_id)
+                    ok += 1
+                except Exception:
+                    nonlocal failures
+                    failures += 1
+            return ok
+
+        start = time.perf_counter()
+        committed = sum(await asyncio.gather(*(worker(n + 1) for n in range(concurrency))))
+        elapsed = time.perf_counter() - start
+        await manager.close()
+
+    label = "sqlite mode" if optimized else "default"
+    print(
+        f"{label:<12} {committed / elapsed:8.0f} votes/s  "
+        f"committed={committed} failed={failures} elapsed={elapsed:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--votes", type=int, default=40, help="votes per concurrent client")
+    args = parser.parse_args()
+
+    print(f"{args.concurrency} concurrent clients x {args.votes} votes")
+    asyncio.run(run(False, args.concurrency, args.votes))
+    asyncio.run(run(True, args.concurrency, args.votes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+
+# Settings are read at import time; give the app a throwaway configuration
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret")
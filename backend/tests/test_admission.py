@@ -0,0 +1,98 @@
+"""Admission queue, eviction and per-key rate limiting."""
+import asyncio
+
+import pytest
+
+from app.services import admission as admission_module
+from app.services.admission import (
+    AdmissionController,
+    Overloaded,
+    Priority,
+    TokenBucketLimiter,
+)
+
+
+def test_admits_up_to_the_limit_without_queueing():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=2, max_queue=1, queue_timeout=0.1)
+        await controller.acquire(Priority.READ)
+        await controller.acquire(Priority.READ)
+        assert controller.in_flight == 2 and controller.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_zero_queue_sheds_immediately():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout=0.1)
+        await controller.acquire(Priority.READ)
+        with pytest.raises(Overloaded):
+            await controller.acquire(Priority.VOTE)
+        assert controller.rejected == 1
+        assert controller.in_flight == 1 and controller.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_queued_request_times_out():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=0.05)
+        await controller.acquire(Priority.READ)
+        with pytest.raises(Overloaded, match="timeout"):
+            await controller.acquire(Priority.READ)
+        assert controller.queued == 0
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_higher_priority_evicts_worst_queued_request():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=1.0)
+        await controller.acquire(Priority.WRITE)
+
+        read = asyncio.create_task(controller.acquire(Priority.READ))
+        await asyncio.sleep(0)
+        vote = asyncio.create_task(controller.acquire(Priority.VOTE))
+        await asyncio.sleep(0)
+
+        with pytest.raises(Overloaded, match="evicted"):
+            await read
+        assert controller.queued == 1
+
+        # The freed slot is handed straight to the queued vote
+        controller.release()
+        await vote
+        assert controller.in_flight == 1 and controller.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_equal_priority_does_not_evict():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=1.0)
+        await controller.acquire(Priority.VOTE)
+
+        first = asyncio.create_task(controller.acquire(Priority.VOTE))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded, match="queue full"):
+            await controller.acquire(Priority.VOTE)
+
+        controller.release()
+        await first
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_allows_burst_then_asks_to_wait(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(admission_module.time, "monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter(rate=2.0, burst=3)
+
+    assert [limiter.consume(1) for _ in range(3)] == [None, None, None]
+    assert limiter.consume(1) == pytest.approx(0.5)
+    # Buckets are per key
+    assert limiter.consume(2) is None
+
+    now[0] += 0.5
+    assert limiter.consume(1) is None
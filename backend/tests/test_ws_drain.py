@@ -0,0 +1,95 @@
+"""Simulated rolling deploy: drain thousands of open WebSocket connections."""
+from collections import Counter
+from typing import List, Optional
+import asyncio
+import json
+import random
+
+from app.services.websocket_manager import (
+    SERVICE_RESTART,
+    ConnectionManager,
+    decode_resume_token,
+)
+
+SOCKETS = 3000
+DEADLINE = 2.0
+BACKOFF = (1.0, 10.0)
+
+
+class FakeWebSocket:
+    """Records what the server sends and when it closes the connection."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, latency: float) -> None:
+        self.loop = loop
+        self.latency = latency
+        self.messages: List[dict] = []
+        self.accepted = False
+        self.closed_at: Optional[float] = None
+        self.close_code: Optional[int] = None
+
+    async def accept(self) -> None:
+        self.accepted = True
+
+    async def send_text(self, text: str) -> None:
+        await asyncio.sleep(self.latency)
+        self.messages.append(json.loads(text))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_at = self.loop.time()
+        self.close_code = code
+
+
+async def simulate_deploy():
+    loop = asyncio.get_running_loop()
+    manager = ConnectionManager(
+        drain_deadline=DEADLINE,
+        drain_batch_size=50,
+        drain_batch_interval=0.1,
+        reconnect_backoff=BACKOFF,
+    )
+
+    sockets = []
+    for n in range(SOCKETS):
+        ws = FakeWebSocket(loop, latency=random.uniform(0, 0.001))
+        # A mix of global listeners and poll subscribers
+        assert await manager.connect(ws, poll_id=None if n % 10 == 0 else n % 50)
+        sockets.append(ws)
+
+    started = loop.time()
+    drain = manager.begin_drain()
+
+    # New connections are refused as soon as the drain starts
+    late = FakeWebSocket(loop, latency=0)
+    refused = not await manager.connect(late)
+
+    await drain
+    return manager, sockets, started, late, refused
+
+
+def test_drain_hints_every_socket_and_spreads_reconnects():
+    manager, sockets, started, late, refused = asyncio.run(simulate_deploy())
+
+    # Every socket gets exactly one reconnect frame with a valid resume token
+    for ws in sockets:
+        assert [message["type"] for message in ws.messages] == ["reconnect"]
+        hint = ws.messages[0]["data"]
+        assert BACKOFF[0] * 1000 <= hint["retry_after_ms"] <= BACKOFF[1] * 1000
+        payload = decode_resume_token(hint["resume_token"])
+        assert payload is not None and payload["type"] == "ws_resume"
+
+    # ...and is closed with "Service Restart" before the deadline
+    assert all(ws.close_code == SERVICE_RESTART for ws in sockets)
+    assert max(ws.closed_at for ws in sockets) - started <= DEADLINE
+    assert not manager.connection_map
+
+    # Connections attempted during the drain are refused without accepting
+    assert refused
+    assert not late.accepted and late.close_code == SERVICE_RESTART
+
+    # Reconnects are spread out instead of all landing at once
+    reconnect_at = [
+        ws.closed_at - started + ws.messages[0]["data"]["retry_after_ms"] / 1000
+        for ws in sockets
+    ]
+    peak_per_second = max(Counter(int(t) for t in reconnect_at).values())
+    assert peak_per_second < SOCKETS / 4
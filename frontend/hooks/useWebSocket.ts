@@ -1,9 +1,15 @@
 'use client';
 
-import { useEffect } from 'react';
-import { useAppDispatch } from '@/lib/store/hooks';
+import { useEffect, useRef } from 'react';
+import { useAppDispatch, useAppSelector } from '@/lib/store/hooks';
 import { setConnection } from '@/lib/store/slices/websocketSlice';
-import { addNewPoll, updatePollLikes, updatePollVotes } from '@/lib/store/slices/pollsSlice';
+import {
+  addNewPoll,
+  fetchPoll,
+  fetchPolls,
+  updatePollLikes,
+  updatePollVotes,
+} from '@/lib/store/slices/pollsSlice';
 import type { Poll, PollOption } from '@/lib/store/slices/pollsSlice';
 
 const resolveWebSocketUrl = (): string => {
@@ -29,6 +35,9 @@ const resolveWebSocketUrl = (): string => {
 
 const WS_URL = resolveWebSocketUrl();
 
+// Fallback delay before reconnecting when the server sent no hint
+const DEFAULT_RECONNECT_DELAY_MS = 3000;
+
 const toNumber = (value: unknown, fallback = 0): number => {
   const parsed = typeof value === 'number' ? value : Number(value);
   return Number.isFinite(parsed) ? parsed : fallback;
@@ -121,12 +130,20 @@ const normalisePollPayload = (data: unknown): Poll | null => {
 
 export const useWebSocket = (pollId?: number) => {
   const dispatch = useAppDispatch();
+  const { token } = useAppSelector((state) => state.auth);
+  // Read by the refetch below without reconnecting when the token changes
+  const tokenRef = useRef(token);
+  tokenRef.current = token;
 
   useEffect(() => {
     let socket: WebSocket | null = null;
     let pingInterval: ReturnType<typeof setInterval> | null = null;
     let reconnectTimeout: ReturnType<typeof setTimeout> | null = null;
     let isManuallyClosing = false;
+    let hasConnected = false;
+    // Set by a `reconnect` frame when the server is draining for a restart
+    let retryAfterMs: number | null = null;
+    let resumeToken: string | null = null;
 
     const clearTimers = () => {
       if (pingInterval) {
@@ -140,6 +157,15 @@ export const useWebSocket = (pollId?: number) => {
       }
     };
 
+    // Updates may have been missed while disconnected
+    const refetch = () => {
+      if (pollId) {
+        dispatch(fetchPoll({ pollId, token: tokenRef.current }));
+      } else {
+        dispatch(fetchPolls(tokenRef.current));
+      }
+    };
+
     const handleMessage = (event: MessageEvent) => {
       try {
         if (event.data === 'pong') {
@@ -189,6 +215,18 @@ export const useWebSocket = (pollId?: number) => {
             }
             break;
           }
+          case 'reconnect': {
+            const delay = Number(message.data?.retry_after_ms);
+            retryAfterMs = Number.isFinite(delay) && delay >= 0 ? delay : null;
+            resumeToken = toOptionalString(message.data?.resume_token) ?? null;
+            break;
+          }
+          case 'resumed': {
+            // Only confirms the subscription is back; updates sent while
+            // disconnected are not replayed, so the refetch on open stands
+            console.debug('WebSocket subscription resumed:', message.data?.poll_id);
+            break;
+          }
           default: {
             console.debug('Unhandled WebSocket message type:', message.type);
           }
@@ -199,13 +237,28 @@ export const useWebSocket = (pollId?: number) => {
     };
 
     const connect = () => {
-      const url = pollId ? `${WS_URL}?poll_id=${pollId}` : WS_URL;
-      socket = new WebSocket(url);
+      const params = new URLSearchParams();
+      if (pollId) {
+        params.set('poll_id', String(pollId));
+      }
+      if (resumeToken) {
+        params.set('resume', resumeToken);
+      }
+      const query = params.toString();
+      socket = new WebSocket(query ? `${WS_URL}?${query}` : WS_URL);
 
       socket.onopen = () => {
         console.info('WebSocket connected');
         dispatch(setConnection(socket));
 
+        // Updates sent while disconnected are lost; the randomized
+        // `retry_after_ms` spreads these refetches out after a restart
+        resumeToken = null;
+        if (hasConnected) {
+          refetch();
+        }
+        hasConnected = true;
+
         if (pingInterval) {
           clearInterval(pingInterval);
         }
@@ -229,10 +282,12 @@ export const useWebSocket = (pollId?: number) => {
         clearTimers();
 
         if (!isManuallyClosing) {
+          const delay = retryAfterMs ?? DEFAULT_RECONNECT_DELAY_MS;
+          retryAfterMs = null;
           reconnectTimeout = setTimeout(() => {
             console.info('Attempting WebSocket reconnection...');
             connect();
-          }, 3000);
+          }, delay);
         }
       };
     };
@@ -48,6 +48,15 @@ export interface RegisterData {
 }
 
 export interface WebSocketMessage {
-  type: 'vote_update' | 'like_update' | 'poll_created';
+  type: 'vote_update' | 'like_update' | 'poll_created' | 'reconnect' | 'resumed';
   data: any;
 }
+
+export interface WebSocketReconnectData {
+  retry_after_ms: number;
+  resume_token: string;
+}
+
+export interface WebSocketResumedData {
+  poll_id: number | null;
+}